@@ -1,4 +1,13 @@
 from test_actor import ActorTestCase
 from test_cast import TeamTestCase
 from test_clock import ClockTestCase
-from test_task import TaskTestCase
\ No newline at end of file
+from test_columns import TaskColumnsTestCase
+from test_crowd import CrowdActorTestCase
+from test_ensemble import EnsembleTestCase
+from test_events import EventStreamTestCase
+from test_failures import FailureLogTestCase
+from test_mailbox import MailboxTestCase
+from test_scene import SceneTestCase
+from test_statistics import RunningStatisticsTestCase, StatisticsCollectorTestCase
+from test_task import TaskTestCase, TaskRunTestCase, WorkflowResolutionTestCase
+from test_workflow import WorkflowPoolTestCase
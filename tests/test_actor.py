@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from theatre_ag import TaskQueueActor, Idling, SynchronizingClock, default_cost
+from theatre_ag import TaskQueueActor, Idling, SynchronizingClock, default_cost, format_task_trees
+from theatre_ag import TracingPolicy, TRACE_TOP_LEVEL, TRACE_DEPTH_LIMITED, TRACE_FULL
 
 
 class ExampleWorkflow(object):
@@ -22,6 +23,38 @@ class ExampleWorkflow(object):
     def task_c(self):
         raise Exception()
 
+    @default_cost(1)
+    def task_d(self):
+        self.task_b()
+        raise Exception()
+
+    @default_cost(1)
+    def task_e(self):
+        self.task_c()
+
+
+class LoopingWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(0)
+    def loop(self, count):
+        for _ in range(0, count):
+            self.step()
+
+    @default_cost(1)
+    def step(self):
+        self.leaf()
+
+    @default_cost(0)
+    def leaf(self):
+        pass
+
+
+class UntracedIdling(Idling):
+
+    tracing_policy = TracingPolicy(TRACE_TOP_LEVEL)
+
 
 class ActorTestCase(TestCase):
 
@@ -36,6 +69,18 @@ class ActorTestCase(TestCase):
         self.clock.start()
         self.clock.wait_for_last_tick()
 
+    def test_start_twice_raises(self):
+        self.actor.start()
+        self.assertRaises(RuntimeError, self.actor.start)
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+
+    def test_resources_created_when_first_needed(self):
+        self.assertIsNone(self.actor._mailbox)
+        self.assertIsNone(self.actor._busy)
+        mailbox = self.actor.mailbox
+        self.assertIs(mailbox, self.actor.mailbox)
+
     def test_explicit_idle(self):
 
         self.actor.allocate_task(self.idling.idle, self.idling)
@@ -87,6 +132,32 @@ class ActorTestCase(TestCase):
 
         self.assertEquals('task_c()[0->1]', str(self.actor.last_task))
 
+    def test_failures_recorded(self):
+
+        self.actor.allocate_task(self.example_workflow.task_c, self.example_workflow)
+        self.actor.allocate_task(self.example_workflow.task_b, self.example_workflow)
+        self.actor.allocate_task(self.example_workflow.task_c, self.example_workflow)
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEquals(2, self.actor.failures.count)
+        self.assertEquals({'ExampleWorkflow.task_c': 2}, self.actor.failures.counts)
+        self.assertEquals(['task_c()[3->?]'], self.actor.failures.recent[-1].task_chain)
+        self.assertEquals(4, self.actor.failures.recent[-1].tick)
+
+    def test_failure_records_active_task_chain(self):
+
+        self.actor.allocate_task(self.example_workflow.task_d, self.example_workflow)
+        self.actor.allocate_task(self.example_workflow.task_e, self.example_workflow)
+
+        self.clock.max_ticks = 6
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEquals(['task_d()[0->?]'], self.actor.failures.recent[0].task_chain)
+        self.assertEquals(['task_e()[3->?]', 'task_c()[4->?]'], self.actor.failures.recent[1].task_chain)
+
     def test_insufficient_time_shutdown_cleanly(self):
         """
         Demonstrate that actors can shutdown cleanly if their allocated tasks proceed beyond the maximum clock time.
@@ -118,3 +189,69 @@ class ActorTestCase(TestCase):
 
         self.assertEquals('task_b()[0->2]', str(self.actor.last_task))
 
+    def test_full_tracing_records_sub_tasks(self):
+
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEquals(
+            '--+-> task_a()[0->3]\n  +-+-> task_b()[1->3]\n    +---> idle()[2->3]\n',
+            format_task_trees(self.actor.task_history))
+
+    def test_top_level_tracing(self):
+
+        self.actor.tracing_policy = TracingPolicy(TRACE_TOP_LEVEL)
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEquals('task_a()[0->3]', str(self.actor.last_task))
+        self.assertEquals(0, len(self.actor.last_task.sub_tasks))
+
+    def test_depth_limited_tracing(self):
+
+        self.actor.tracing_policy = TracingPolicy(TRACE_DEPTH_LIMITED, max_depth=1)
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEquals(['task_b()[1->3]'], [str(task) for task in self.actor.last_task.sub_tasks])
+        self.assertEquals(0, len(self.actor.last_task.sub_tasks[0].sub_tasks))
+
+    def test_sampled_tracing(self):
+
+        self.actor.tracing_policy = TracingPolicy(TRACE_FULL, sample_every=2)
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [3])
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEquals(['idle()[0->1]', 'idle()[2->3]'], [str(task) for task in self.actor.last_task.sub_tasks])
+
+    def test_sampling_counts_only_admitted_sub_tasks(self):
+
+        self.actor.tracing_policy = TracingPolicy(TRACE_DEPTH_LIMITED, max_depth=1, sample_every=2)
+        looping_workflow = LoopingWorkflow()
+        self.actor.allocate_task(looping_workflow.loop, looping_workflow, [4])
+        self.actor.initiate_shutdown()
+
+        self.clock.max_ticks = 6
+        self.run_clock()
+
+        self.assertEquals(['step()[0->1]', 'step()[2->3]'], [str(task) for task in self.actor.last_task.sub_tasks])
+
+    def test_workflow_class_tracing_policy(self):
+
+        untraced_idling = UntracedIdling()
+        self.actor.allocate_task(untraced_idling.idle_for, untraced_idling, [3])
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEquals('idle_for(3)[0->3]', str(self.actor.last_task))
+        self.assertEquals(0, len(self.actor.last_task.sub_tasks))
+
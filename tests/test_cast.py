@@ -1,6 +1,9 @@
+import os
+import shutil
+import tempfile
 import unittest
 
-from theatre_ag import SynchronizingClock, Cast, TaskQueueActor, Idling
+from theatre_ag import SynchronizingClock, Cast, TaskQueueActor, Idling, Episode, StreamedDirections
 
 
 class TeamTestCase(unittest.TestCase):
@@ -32,6 +35,36 @@ class TeamTestCase(unittest.TestCase):
         for actor in self.cast.members:
             self.assertEquals('idle()[0->1]', str(actor.last_task))
 
+    def test_assemble(self):
+
+        cast = Cast.assemble(self.clock, range(0, 10))
+
+        self.assertEqual(10, len(cast.members))
+        self.assertEqual(set(cast.members), set(self.clock._tick_listeners))
+
+    def test_streamed_directions(self):
+
+        clock = SynchronizingClock(max_ticks=4)
+        cast = Cast.assemble(clock, ['alice', 'bob'])
+
+        directory = tempfile.mkdtemp()
+        try:
+            jsonl_path = os.path.join(directory, 'directions.jsonl')
+            with open(jsonl_path, 'w') as directions_file:
+                directions_file.write('{"actor": "alice", "workflow": "idling", "entry_point": "idle_for", "args": [2]}\n')
+            csv_path = os.path.join(directory, 'directions.csv')
+            with open(csv_path, 'w') as directions_file:
+                directions_file.write('actor,workflow,entry_point,args\nbob,idling,idle_for,[3]\n')
+
+            cast.improvise(StreamedDirections(jsonl_path, {'idling': Idling}))
+            Episode(clock, cast, StreamedDirections(csv_path, {'idling': Idling})).perform()
+            cast.shutdown()
+        finally:
+            shutil.rmtree(directory)
+
+        last_tasks = sorted(str(actor.last_task) for actor in cast.members)
+        self.assertEqual(['idle_for(2)[0->2]', 'idle_for(3)[0->3]'], last_tasks)
+
 
 if __name__ == '__main__':
     unittest.main()
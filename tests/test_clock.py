@@ -1,10 +1,22 @@
 import unittest
 from mock import Mock
 
-from theatre_ag import SynchronizingClock
+from theatre_ag import SynchronizingClock, ChildClock, TaskQueueActor, Idling, StallWatchdog, default_cost
 
 # noinspection PyProtectedMember
-from threading import _Event
+from threading import _Event, Event
+
+
+class BlockingWorkflow(object):
+
+    is_workflow = True
+
+    def __init__(self):
+        self.released = Event()
+
+    @default_cost(1)
+    def block(self):
+        self.released.wait()
 
 
 class ClockTestCase(unittest.TestCase):
@@ -24,6 +36,114 @@ class ClockTestCase(unittest.TestCase):
         self.tick_listener.waiting_for_tick.wait.assert_called_once_with()
         self.tick_listener.notify_new_tick.assert_called_once_with()
 
+    def test_child_clock_ticks_every_period(self):
+
+        child_clock = ChildClock(self.clock, 2)
+
+        self.clock.tick()
+        self.assertEqual(0, child_clock.current_tick)
+
+        self.clock.tick()
+        self.assertEqual(1, child_clock.current_tick)
+        self.assertEqual(2, child_clock.global_tick)
+        self.assertFalse(child_clock.will_tick_again)
+
+    def test_child_clock_closes_ticks_before_parent_ticks(self):
+
+        child_clock = ChildClock(self.clock, 2)
+
+        parent_ticks = list()
+        boundary_listener = Mock()
+        boundary_listener.close_tick.side_effect = lambda tick: parent_ticks.append(self.clock.current_tick)
+        child_clock.add_tick_boundary_listener(boundary_listener)
+
+        self.clock.tick()
+        self.clock.tick()
+
+        boundary_listener.close_tick.assert_called_once_with(0)
+        self.assertEqual([1], parent_ticks)
+
+    def test_child_clock_actors_cannot_message_parent_clock_actors(self):
+
+        child_clock = ChildClock(self.clock, 2)
+
+        fine_actor = TaskQueueActor('fine', self.clock, register_with_clock=False)
+        coarse_actor = TaskQueueActor('coarse', child_clock, register_with_clock=False)
+
+        self.assertRaises(ValueError, coarse_actor.send_message, fine_actor, 'hello')
+        self.assertRaises(ValueError, fine_actor.send_message, coarse_actor, 'hello')
+
+    def test_child_clock_actors_record_global_ticks(self):
+
+        clock = SynchronizingClock(max_ticks=6)
+        child_clock = ChildClock(clock, 3)
+
+        fine_actor = TaskQueueActor('fine', clock)
+        coarse_actor = TaskQueueActor('coarse', child_clock)
+
+        for actor in [fine_actor, coarse_actor]:
+            idling = Idling()
+            actor.allocate_task(idling.idle_for, idling, [2])
+            actor.initiate_shutdown()
+            actor.start()
+
+        clock.start()
+        clock.wait_for_last_tick()
+        fine_actor.wait_for_shutdown()
+        coarse_actor.wait_for_shutdown()
+
+        self.assertEqual('idle_for(2)[0->2]', str(fine_actor.last_task))
+        self.assertEqual('idle_for(2)[0->6]', str(coarse_actor.last_task))
+
+    def test_watchdog_reports_and_aborts_stalled_tick(self):
+
+        reports = list()
+        clock = SynchronizingClock(max_ticks=5, watchdog=StallWatchdog(0.05, abort=True, report_handler=reports.append))
+
+        actor = TaskQueueActor('alice', clock)
+        blocking_workflow = BlockingWorkflow()
+        actor.allocate_task(blocking_workflow.block, blocking_workflow)
+
+        actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+
+        blocking_workflow.released.set()
+        actor.wait_for_shutdown()
+
+        self.assertEqual(1, len(reports))
+        self.assertEqual(1, reports[0].tick)
+        self.assertEqual([actor], [stalled.listener for stalled in reports[0].stalled_listeners])
+        self.assertEqual(['block()[0->?]'], reports[0].stalled_listeners[0].task_chain)
+        self.assertTrue('self.released.wait()' in ''.join(reports[0].stalled_listeners[0].stack))
+        self.assertFalse(clock.will_tick_again)
+
+    def test_watchdog_reports_stalled_child_clock_actor(self):
+
+        reports = list()
+        clock = SynchronizingClock(max_ticks=6, watchdog=StallWatchdog(0.05, abort=True, report_handler=reports.append))
+        child_clock = ChildClock(clock, 2)
+
+        fine_actor = TaskQueueActor('fine', clock)
+        coarse_actor = TaskQueueActor('coarse', child_clock)
+        blocking_workflow = BlockingWorkflow()
+        coarse_actor.allocate_task(blocking_workflow.block, blocking_workflow)
+
+        fine_actor.start()
+        coarse_actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+
+        blocking_workflow.released.set()
+        fine_actor.wait_for_shutdown()
+        coarse_actor.wait_for_shutdown()
+
+        self.assertEqual(1, len(reports))
+        self.assertEqual(3, reports[0].tick)
+        self.assertEqual([coarse_actor], [stalled.listener for stalled in reports[0].stalled_listeners])
+        self.assertEqual(['block()[0->?]'], reports[0].stalled_listeners[0].task_chain)
+        self.assertFalse(clock.will_tick_again)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from theatre_ag import SynchronizingClock, Cast, TaskQueueActor, Idling
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TaskColumnsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=5)
+        self.cast = Cast()
+
+        for name, duration in [('alice', 2), ('bob', 3)]:
+            actor = TaskQueueActor(name, self.clock)
+            idling = Idling()
+            actor.allocate_task(idling.idle_for, idling, [duration])
+            actor.initiate_shutdown()
+            self.cast.add_member(actor)
+
+        self.cast.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+        self.cast.wait_for_shutdown()
+
+        self.columns = self.cast.task_columns()
+
+    def test_flattened_rows(self):
+
+        self.assertEqual(7, len(self.columns))
+        self.assertEqual(['a_alice', 'a_bob'], self.columns.actors)
+        self.assertEqual([0, 1, 1, 0, 1, 1, 1], list(self.columns.tasks['depth']))
+        self.assertEqual([-1, 0, 0, -1, 3, 3, 3], list(self.columns.tasks['parent']))
+
+    def test_task_count_matches_cast(self):
+
+        self.assertEqual(
+            self.cast.task_count(lambda task: task.entry_point.__name__ == 'idle'),
+            self.columns.task_count(entry_points=['Idling.idle']))
+        self.assertEqual(2, self.columns.task_count(actors=['a_alice'], entry_points=['Idling.idle']))
+
+    def test_last_tick_matches_cast(self):
+
+        self.assertEqual(self.cast.last_tick, self.columns.last_tick)
+
+    def test_save_and_load(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            prefix = os.path.join(directory, 'episode')
+            self.columns.save(prefix)
+
+            loaded = self.columns.load(prefix)
+
+            self.assertEqual(self.columns.entry_points, loaded.entry_points)
+            self.assertEqual(list(self.columns.tasks['finish_tick']), list(loaded.tasks['finish_tick']))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+import os
+import sys
+import unittest
+
+from mock import patch
+from multiprocessing import Pool
+
+from theatre_ag import CrowdActor, NestedWaitException, SynchronizingClock, Cast, Idling, default_cost, independent, \
+    format_task_trees
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+
+class CountingWorkflow(object):
+
+    is_workflow = True
+
+    def __init__(self):
+        self.count = 0
+
+    @default_cost(2)
+    def short_step(self):
+        self.count += 1
+
+    @default_cost(3)
+    def long_step(self):
+        self.count += 1
+
+    @default_cost(1)
+    def failing_step(self):
+        raise Exception()
+
+
+@independent
+class ProcessRecordingWorkflow(object):
+
+    is_workflow = True
+
+    def __init__(self):
+        self.pids = list()
+        self.unpicklable = None
+
+    @default_cost(1)
+    def record_pid(self):
+        self.pids.append(os.getpid())
+        return len(self.pids)
+
+    @default_cost(1)
+    def fail(self):
+        raise ValueError()
+
+    @default_cost(1)
+    def record_pid_twice(self):
+        self.record_pid()
+        self.record_pid()
+
+
+class CrowdActorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=6)
+        self.crowd = CrowdActor('crowd', self.clock)
+        self.workflow = CountingWorkflow()
+
+    def run_crowd(self):
+        self.crowd.initiate_shutdown()
+        self.crowd.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+        self.crowd.wait_for_shutdown()
+
+    def test_members_share_single_tick_listener(self):
+
+        for name in range(0, 100):
+            self.crowd.add_member(name)
+
+        self.assertEqual(1, len(self.clock._tick_listeners))
+
+    def test_members_perform_concurrently(self):
+
+        alice = self.crowd.add_member('alice')
+        bob = self.crowd.add_member('bob')
+
+        for _ in range(0, 2):
+            alice.allocate_task(self.workflow.short_step, self.workflow)
+            bob.allocate_task(self.workflow.long_step, self.workflow)
+
+        self.run_crowd()
+
+        self.assertEqual(['short_step()[0->2]', 'short_step()[2->4]'], [str(task) for task in alice.task_history])
+        self.assertEqual(['long_step()[0->3]', 'long_step()[3->6]'], [str(task) for task in bob.task_history])
+        self.assertEqual(4, self.workflow.count)
+        self.assertEqual(6, Cast([self.crowd]).last_tick)
+
+    @unittest.skipIf(greenlet is None, "greenlet is not installed")
+    def test_nested_wait_suspends_only_member(self):
+
+        alice = self.crowd.add_member('alice')
+        bob = self.crowd.add_member('bob')
+
+        idling = Idling()
+        alice.allocate_task(idling.idle_for, idling, [3])
+        for _ in range(0, 3):
+            bob.allocate_task(self.workflow.long_step, self.workflow)
+
+        self.clock.max_ticks = 9
+        self.run_crowd()
+
+        self.assertEqual('idle_for(3)[0->3]', str(alice.last_task))
+        self.assertEqual(['idle()[0->1]', 'idle()[1->2]', 'idle()[2->3]'],
+                         [str(task) for task in alice.last_task.sub_tasks])
+        self.assertEqual(['long_step()[0->3]', 'long_step()[3->6]', 'long_step()[6->9]'],
+                         [str(task) for task in bob.task_history])
+
+    def test_nested_wait_without_greenlet_fails_task(self):
+
+        alice = self.crowd.add_member('alice')
+        bob = self.crowd.add_member('bob')
+
+        idling = Idling()
+        alice.allocate_task(idling.idle_for, idling, [3])
+        bob.allocate_task(self.workflow.short_step, self.workflow)
+
+        with patch.object(sys.modules[CrowdActor.__module__], 'greenlet', None):
+            self.run_crowd()
+
+        self.assertEqual(1, alice.failures.count)
+        self.assertIsInstance(alice.failures.recent[0].exception, NestedWaitException)
+        self.assertEqual(['short_step()[0->2]'], [str(task) for task in bob.task_history])
+
+    def test_member_failure_does_not_halt_crowd(self):
+
+        alice = self.crowd.add_member('alice')
+        alice.allocate_task(self.workflow.failing_step, self.workflow)
+        alice.allocate_task(self.workflow.short_step, self.workflow)
+
+        self.run_crowd()
+
+        self.assertEqual(['failing_step()[0->1]', 'short_step()[1->3]'], [str(task) for task in alice.task_history])
+        self.assertEqual(1, alice.failures.count)
+        self.assertEqual(1, self.crowd.failures.count)
+        self.assertEqual('alice', self.crowd.failures.recent[0].actor)
+
+    def test_independent_tasks_performed_in_process_pool(self):
+
+        self.crowd.process_pool = Pool(2)
+        try:
+            members = [self.crowd.add_member(name) for name in range(0, 4)]
+            workflows = [ProcessRecordingWorkflow() for _ in members]
+
+            for member, workflow in zip(members, workflows):
+                member.allocate_task(workflow.record_pid, workflow)
+                member.allocate_task(workflow.record_pid, workflow)
+
+            workflows[0].unpicklable = lambda: None
+
+            self.run_crowd()
+        finally:
+            self.crowd.process_pool.terminate()
+
+        for member in members:
+            self.assertEqual(['record_pid()[0->1]', 'record_pid()[1->2]'], [str(task) for task in member.task_history])
+
+        self.assertEqual([os.getpid(), os.getpid()], workflows[0].pids)
+        for workflow in workflows[1:]:
+            self.assertEqual(2, len(workflow.pids))
+            self.assertFalse(os.getpid() in workflow.pids)
+
+
+    def test_independent_task_failure_fails_only_its_member(self):
+
+        self.crowd.process_pool = Pool(2)
+        try:
+            members = [self.crowd.add_member(name) for name in range(0, 4)]
+            workflows = [ProcessRecordingWorkflow() for _ in members]
+
+            for member, workflow in zip(members, workflows):
+                member.allocate_task(workflow.fail if member is members[1] else workflow.record_pid, workflow)
+
+            self.run_crowd()
+        finally:
+            self.crowd.process_pool.terminate()
+
+        self.assertEqual([0, 1, 0, 0], [member.failures.count for member in members])
+        self.assertIsInstance(members[1].failures.recent[0].exception, ValueError)
+        self.assertEqual(1, self.crowd.failures.count)
+        self.assertEqual([1, 0, 1, 1], [len(workflow.pids) for workflow in workflows])
+
+    def test_independent_tasks_with_nested_calls_timed_as_without_pool(self):
+
+        task_histories = list()
+        for process_pool in [None, Pool(2)]:
+            clock = SynchronizingClock(max_ticks=6)
+            self.crowd = CrowdActor('crowd', clock, process_pool=process_pool)
+            self.clock = clock
+            try:
+                members = [self.crowd.add_member(name) for name in range(0, 2)]
+                for member in members:
+                    workflow = ProcessRecordingWorkflow()
+                    member.allocate_task(workflow.record_pid_twice, workflow)
+                    member.allocate_task(workflow.record_pid, workflow)
+
+                self.run_crowd()
+            finally:
+                if process_pool is not None:
+                    process_pool.terminate()
+
+            task_histories.append([format_task_trees(member.task_history) for member in members])
+
+        self.assertEqual(task_histories[0], task_histories[1])
+        self.assertIn('+---> record_pid()[2->3]', task_histories[1][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
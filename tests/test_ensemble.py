@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from theatre_ag import Ensemble, Episode, SynchronizingClock, Cast, TaskQueueActor, Idling
+
+
+class IdleDirections(object):
+
+    def __init__(self, duration):
+        self.duration = duration
+
+    def apply(self, members):
+        for actor in members:
+            idling = Idling()
+            actor.allocate_task(idling.idle_for, idling, [self.duration])
+            actor.initiate_shutdown()
+
+
+def fixed_episode(seed):
+    clock = SynchronizingClock(max_ticks=5)
+    cast = Cast([TaskQueueActor('alice', clock)])
+    return Episode(clock, cast, IdleDirections(2))
+
+
+def random_episode(seed):
+    clock = SynchronizingClock(max_ticks=5)
+    cast = Cast([TaskQueueActor('alice', clock)])
+    return Episode(clock, cast, IdleDirections(random.Random(seed).randint(1, 4)))
+
+
+def last_tick(episode):
+    return episode.cast.last_tick
+
+
+class EnsembleTestCase(unittest.TestCase):
+
+    def test_stops_once_converged(self):
+
+        ensemble = Ensemble(fixed_episode, {'last_tick': last_tick}, target_width=0.5, min_replications=3)
+
+        progress = ensemble.run()
+
+        self.assertEqual(3, progress.replications)
+        self.assertTrue(progress.converged)
+        self.assertEqual(2, progress.summaries['last_tick'].mean)
+
+    def test_stops_at_max_replications(self):
+
+        reports = list()
+        ensemble = Ensemble(random_episode, {'last_tick': last_tick}, target_width=0.01, min_replications=2,
+                            max_replications=5, seed=1)
+
+        progress = ensemble.run(reports.append)
+
+        self.assertEqual(5, progress.replications)
+        self.assertFalse(progress.converged)
+        self.assertEqual([1, 2, 3, 4, 5], [report.replications for report in reports])
+        self.assertEqual([1, 2, 3, 4, 5], [report.summaries['last_tick'].count for report in reports])
+
+    def test_parallel_workers(self):
+
+        ensemble = Ensemble(fixed_episode, {'last_tick': last_tick}, target_width=0.5, min_replications=4, workers=2)
+
+        progress = ensemble.run()
+
+        self.assertEqual(4, progress.replications)
+        self.assertEqual(2, progress.summaries['last_tick'].mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
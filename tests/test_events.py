@@ -0,0 +1,81 @@
+import unittest
+
+from theatre_ag import SynchronizingClock, ChildClock, TaskQueueActor, Idling, TICK_STARTED, TICK_COMPLETED, TASK_INITIATED, \
+    TASK_COMPLETED
+
+
+class EventStreamTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=2)
+        self.actor = TaskQueueActor('alice', self.clock)
+        self.idling = Idling()
+
+    def run_clock(self):
+        self.actor.allocate_task(self.idling.idle, self.idling)
+        self.actor.initiate_shutdown()
+        self.actor.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+        self.actor.wait_for_shutdown()
+
+    def test_tick_and_task_events(self):
+
+        subscription = self.clock.event_stream.subscribe()
+
+        self.run_clock()
+
+        self.assertEqual(
+            [(TASK_INITIATED, 0), (TICK_COMPLETED, 0), (TICK_STARTED, 1), (TASK_COMPLETED, 1)],
+            [(event.kind, event.tick) for event in subscription.drain()][0:4])
+
+    def test_child_clock_events_on_root_timeline(self):
+
+        clock = SynchronizingClock(max_ticks=4)
+        child_clock = ChildClock(clock, 2)
+        actor = TaskQueueActor('bob', child_clock)
+        subscription = child_clock.event_stream.subscribe()
+
+        actor.allocate_task(self.idling.idle, self.idling)
+        actor.initiate_shutdown()
+        actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+        actor.wait_for_shutdown()
+
+        self.assertEqual(
+            [(TASK_INITIATED, 0), (TICK_COMPLETED, 0), (TICK_STARTED, 2), (TASK_COMPLETED, 2)],
+            [(event.kind, event.tick) for event in subscription.drain()][0:4])
+
+    def test_filtered_events(self):
+
+        subscription = self.clock.event_stream.subscribe(kinds=[TICK_STARTED])
+
+        self.run_clock()
+
+        self.assertEqual([1, 2], [event.tick for event in subscription.drain()])
+
+    def test_drop_when_full(self):
+
+        subscription = self.clock.event_stream.subscribe(kinds=[TICK_STARTED], buffer_size=1)
+
+        self.run_clock()
+
+        self.assertEqual([1], [event.tick for event in subscription.drain()])
+        self.assertEqual(1, subscription.dropped)
+
+    def test_batch_per_tick(self):
+
+        subscription = self.clock.event_stream.subscribe(batch_per_tick=True)
+
+        self.run_clock()
+
+        batches = subscription.drain()
+
+        self.assertEqual(2, len(batches))
+        self.assertEqual([TASK_INITIATED, TICK_COMPLETED], [event.kind for event in batches[0]])
+        self.assertEqual(TICK_COMPLETED, batches[1][-1].kind)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import sys
+import unittest
+
+from StringIO import StringIO
+
+from theatre_ag import AsyncFailureSink, FailureLog, Task
+
+
+class ExampleWorkflow(object):
+
+    is_workflow = True
+
+    def task_a(self):
+        pass
+
+    def task_b(self):
+        pass
+
+
+class FailureLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        workflow = ExampleWorkflow()
+        self.task = Task(workflow.task_a, workflow)
+        self.task.initiate(0)
+        sub_task = self.task.append_sub_task(workflow.task_b, workflow)
+        sub_task.initiate(1)
+        sub_task.complete(2)
+        self.task.complete(2)
+
+    def test_record(self):
+        log = FailureLog(capacity=2)
+        for tick in range(0, 3):
+            log.record('alice', tick, self.task, ValueError(tick))
+        log.record('alice', 3, None, ValueError(3))
+
+        self.assertEqual(4, log.count)
+        self.assertEqual({'ExampleWorkflow.task_a': 3, None: 1}, log.counts)
+        self.assertEqual([2, 3], [failure.tick for failure in log.recent])
+
+    def test_task_chain(self):
+        log = FailureLog()
+        log.record('alice', 1, self.task, ValueError())
+        log.record('alice', 1, self.task, ValueError(), ['task_a()[0->?]', 'task_b()[1->?]'])
+
+        self.assertEqual(['task_a()[0->2]'], log.recent[0].task_chain)
+        self.assertEqual(['task_a()[0->?]', 'task_b()[1->?]'], log.recent[1].task_chain)
+
+    def test_merged(self):
+        alice_log = FailureLog()
+        alice_log.record('alice', 0, self.task, ValueError())
+        bob_log = FailureLog()
+        bob_log.record('bob', 0, self.task, ValueError())
+        bob_log.record('bob', 1, None, ValueError())
+
+        log = FailureLog.merged([alice_log, bob_log])
+
+        self.assertEqual(3, log.count)
+        self.assertEqual({'ExampleWorkflow.task_a': 2, None: 1}, log.counts)
+        self.assertEqual(['alice', 'bob', 'bob'], [failure.actor for failure in log.recent])
+
+    def test_async_sink(self):
+        written = list()
+        log = FailureLog(sink=AsyncFailureSink(written.append))
+        log.record('alice', 1, self.task, ValueError('broken'))
+        log.sink.flush()
+
+        self.assertEqual(1, len(written))
+        self.assertIn('actor [alice] encountered exception [broken]', written[0])
+
+    def test_async_sink_writes_to_current_stderr(self):
+        sink = AsyncFailureSink()
+        log = FailureLog(sink=sink)
+
+        stderr, sys.stderr = sys.stderr, StringIO()
+        try:
+            log.record('alice', 1, self.task, ValueError('broken'))
+            sink.flush()
+            written = sys.stderr.getvalue()
+        finally:
+            sys.stderr = stderr
+
+        self.assertIn('actor [alice] encountered exception [broken]', written)
+
+    def test_task_chain_and_entry_point_key(self):
+        sub_task = self.task.sub_tasks[0]
+
+        self.assertEqual(['task_a()[0->2]', 'task_b()[1->2]'], sub_task.task_chain)
+        self.assertEqual('ExampleWorkflow.task_b', sub_task.entry_point_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from theatre_ag import SynchronizingClock, TaskQueueActor, default_cost
+
+
+class MessagingWorkflow(object):
+
+    is_workflow = True
+
+    def __init__(self):
+        self.received = None
+
+    @default_cost(1)
+    def send(self, receiver, content):
+        self.actor.send_message(receiver, content)
+
+    @default_cost(1)
+    def receive(self):
+        self.received = [message.content for message in self.actor.receive_messages()]
+
+
+class MailboxTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=3)
+        self.alice = TaskQueueActor('alice', self.clock)
+        self.bob = TaskQueueActor('bob', self.clock)
+        self.charlie = TaskQueueActor('charlie', self.clock)
+
+    def test_messages_delivered_at_tick_boundary(self):
+
+        self.bob.send_message(self.alice, 'hello')
+
+        self.assertEqual([], self.alice.receive_messages())
+
+        self.clock.post_office.close_tick(self.clock.current_tick)
+
+        messages = self.alice.receive_messages()
+        self.assertEqual(['hello'], [message.content for message in messages])
+        self.assertEqual(self.bob, messages[0].sender)
+        self.assertEqual([], self.alice.receive_messages())
+
+    def test_deterministic_delivery_order(self):
+
+        self.charlie.send_message(self.alice, 'c1')
+        self.bob.send_message(self.alice, 'b1')
+        self.charlie.send_message(self.alice, 'c2')
+        self.bob.send_message(self.alice, 'b2')
+
+        self.clock.post_office.close_tick(self.clock.current_tick)
+
+        self.assertEqual(['b1', 'b2', 'c1', 'c2'], [message.content for message in self.alice.receive_messages()])
+
+    def test_message_exchange_between_actors(self):
+
+        sender_workflow = MessagingWorkflow()
+        receiver_workflow = MessagingWorkflow()
+
+        self.bob.allocate_task(sender_workflow.send, sender_workflow, [self.alice, 'hello'])
+        self.alice.allocate_task(receiver_workflow.receive, receiver_workflow)
+        self.alice.allocate_task(receiver_workflow.receive, receiver_workflow)
+
+        for actor in [self.alice, self.bob, self.charlie]:
+            actor.initiate_shutdown()
+            actor.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+
+        self.assertEqual(['hello'], receiver_workflow.received)
+
+
+if __name__ == '__main__':
+    unittest.main()
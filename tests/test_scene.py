@@ -0,0 +1,84 @@
+import unittest
+
+from theatre_ag import SynchronizingClock, Scene, TaskQueueActor, first_write_wins
+
+
+class SceneTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=2)
+        self.scene = Scene(self.clock, {'door': 'closed'})
+
+        self.alice = TaskQueueActor('alice', self.clock, register_with_clock=False)
+        self.bob = TaskQueueActor('bob', self.clock, register_with_clock=False)
+
+    def test_writes_invisible_until_tick_closes(self):
+
+        self.scene.write('door', 'open', self.alice)
+
+        self.assertEqual('closed', self.scene.read('door'))
+
+        self.clock.tick()
+
+        self.assertEqual('open', self.scene.read('door'))
+        self.assertEqual(0, self.scene.version)
+
+    def test_snapshot_unchanged_by_commit(self):
+
+        snapshot = self.scene.snapshot
+        self.scene.write('door', 'open', self.alice)
+
+        self.clock.tick()
+
+        self.assertEqual('closed', snapshot['door'])
+
+    def test_snapshot_read_only(self):
+
+        snapshot = self.scene.snapshot
+
+        with self.assertRaises(TypeError):
+            snapshot['door'] = 'open'
+
+        self.assertEqual({'door': 'closed'}, dict(snapshot))
+
+    def test_conflicting_writes_resolved_by_writer_order(self):
+
+        self.scene.write('door', 'locked', self.bob)
+        self.scene.write('door', 'open', self.alice)
+
+        self.clock.tick()
+
+        self.assertEqual('locked', self.scene.read('door'))
+
+    def test_writers_with_equal_names_ordered_by_creation(self):
+
+        other_alice = TaskQueueActor('alice', self.clock, register_with_clock=False)
+
+        self.scene.write('door', 'locked', other_alice)
+        self.scene.write('door', 'open', self.alice)
+
+        self.clock.tick()
+
+        self.assertEqual('locked', self.scene.read('door'))
+
+    def test_writers_on_other_clocks_rejected(self):
+
+        other_clock = SynchronizingClock(max_ticks=2)
+        other_actor = TaskQueueActor('alice', other_clock, register_with_clock=False)
+
+        self.assertRaises(ValueError, self.scene.write, 'door', 'open', other_actor)
+
+    def test_pluggable_conflict_resolver(self):
+
+        self.scene.conflict_resolver = first_write_wins
+
+        self.scene.write('door', 'locked', self.bob)
+        self.scene.write('door', 'open', self.alice)
+
+        self.clock.tick()
+
+        self.assertEqual('open', self.scene.read('door'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from theatre_ag import RunningStatistics, StatisticsCollector, SynchronizingClock, TaskQueueActor, Idling, Cast, \
+    default_cost
+
+
+class WaitingWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(1)
+    def wait(self, duration):
+        self.actor.idling.idle_for(duration)
+
+
+class RunningStatisticsTestCase(unittest.TestCase):
+
+    def test_record(self):
+        statistics = RunningStatistics()
+        for value in [1, 2, 3, 4, 10]:
+            statistics.record(value)
+
+        self.assertEqual(5, statistics.count)
+        self.assertEqual(4.0, statistics.mean)
+        self.assertEqual(12.5, statistics.variance)
+        self.assertEqual(1, statistics.minimum)
+        self.assertEqual(10, statistics.maximum)
+        self.assertEqual(3, statistics.quantile(0.5))
+        self.assertEqual(10, statistics.quantile(1.0))
+
+    def test_merge(self):
+        left = RunningStatistics()
+        right = RunningStatistics()
+        for value in [1, 2, 3]:
+            left.record(value)
+        for value in [4, 10]:
+            right.record(value)
+
+        merged = left.merge(right)
+
+        self.assertEqual(5, merged.count)
+        self.assertAlmostEqual(4.0, merged.mean)
+        self.assertAlmostEqual(12.5, merged.variance)
+        self.assertEqual(10, merged.maximum)
+
+
+class StatisticsCollectorTestCase(unittest.TestCase):
+
+    def test_actor_statistics(self):
+        clock = SynchronizingClock(max_ticks=4)
+        cast = Cast()
+        for name in ['alice', 'bob']:
+            actor = TaskQueueActor(name, clock)
+            actor.statistics = StatisticsCollector()
+            idling = Idling()
+            actor.allocate_task(idling.idle_for, idling, [3])
+            cast.add_member(actor)
+
+        cast.start()
+        clock.start()
+        clock.wait_for_last_tick()
+        cast.wait_for_shutdown()
+
+        statistics = cast.statistics
+
+        self.assertEqual(2, statistics.duration_statistics('Idling.idle_for').count)
+        self.assertEqual(3, statistics.duration_statistics('Idling.idle_for').mean)
+        self.assertEqual(6, statistics.duration_statistics('Idling.idle').count)
+        self.assertEqual(6, statistics.busy_ticks)
+        self.assertEqual(2, statistics.idle_ticks)
+        self.assertEqual(0.75, statistics.utilisation)
+
+    def test_nested_idling_counts_as_busy(self):
+        clock = SynchronizingClock(max_ticks=6)
+        actor = TaskQueueActor('alice', clock)
+        actor.statistics = StatisticsCollector()
+        workflow = WaitingWorkflow()
+        actor.allocate_task(workflow.wait, workflow, [3])
+
+        actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+        actor.wait_for_shutdown()
+
+        self.assertEqual(4, actor.statistics.busy_ticks)
+        self.assertEqual(2, actor.statistics.idle_ticks)
+        self.assertEqual(3, actor.statistics.duration_statistics('Idling.idle').count)
+
+
+if __name__ == '__main__':
+    unittest.main()
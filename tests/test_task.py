@@ -1,6 +1,6 @@
 import unittest
 
-from theatre_ag.theatre_ag.task import Task
+from theatre_ag.theatre_ag.task import Task, TaskRun, format_task_trees
 from theatre_ag.theatre_ag.workflow import Idling
 
 
@@ -136,5 +136,98 @@ class TaskTestCase(unittest.TestCase):
         self.assertEquals(3, self.task.last_non_idling_tick)
 
 
+class WorkflowResolutionTestCase(unittest.TestCase):
+
+    def test_workflow_resolved_on_demand(self):
+        task = Task(example_sub_task)
+        self.assertIsNone(task._workflow)
+
+        workflow = task.workflow
+        self.assertIs(workflow, task.workflow)
+        self.assertIs(example_sub_task, workflow.example_sub_task)
+
+    def test_anonymous_workflow_class_cached(self):
+        workflow = Task(example_sub_task).workflow
+        other_workflow = Task(example_sub_task).workflow
+
+        self.assertIsNot(workflow, other_workflow)
+        self.assertIs(type(workflow), type(other_workflow))
+        self.assertEquals('AnonymousWorkflow', type(workflow).__name__)
+
+
+class TaskRunTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        def example_task(): pass
+
+        self.task = Task(example_task)
+        self.task.compress_runs = True
+        self.task.initiate(0)
+
+        self.workflow = object()
+
+    def perform_sub_task(self, entry_point, start_tick, finish_tick, args=()):
+        sub_task = self.task.append_sub_task(entry_point, self.workflow, args)
+        sub_task.initiate(start_tick)
+        sub_task.complete(finish_tick)
+        return sub_task
+
+    def test_identical_sub_tasks_are_folded(self):
+        for tick in range(0, 5):
+            self.perform_sub_task(example_sub_task, tick, tick + 1)
+
+        self.assertEquals(1, len(self.task.compressed_sub_tasks))
+        run = self.task.compressed_sub_tasks[0]
+        self.assertIsInstance(run, TaskRun)
+        self.assertEquals(5, run.count)
+        self.assertEquals(0, run.start_tick)
+        self.assertEquals(5, run.finish_tick)
+
+    def test_runs_expand_on_demand(self):
+        for tick in range(0, 3):
+            self.perform_sub_task(example_sub_task, tick * 2, tick * 2 + 2, (1,))
+
+        sub_tasks = self.task.sub_tasks
+        self.assertEquals(3, len(sub_tasks))
+        self.assertEquals([4, 6], [sub_tasks[2].start_tick, sub_tasks[2].finish_tick])
+        self.assertEquals((1,), sub_tasks[1].args)
+        self.assertIs(self.task, sub_tasks[0].parent)
+        self.assertEquals(6, self.task.last_non_idling_tick)
+
+    def test_differing_sub_tasks_are_not_folded(self):
+        self.perform_sub_task(example_sub_task, 0, 1, (1,))
+        self.perform_sub_task(example_sub_task, 1, 2, (2,))
+        self.perform_sub_task(example_sub_task, 2, 4, (2,))
+        self.perform_sub_task(example_sub_task, 5, 7, (2,))
+
+        self.assertEquals(4, len(self.task.compressed_sub_tasks))
+        self.assertEquals(4, len(self.task.sub_tasks))
+
+    def test_sub_tasks_with_sub_tasks_are_not_folded(self):
+        sub_task = self.task.append_sub_task(example_sub_task, self.workflow)
+        sub_task.initiate(0)
+        sub_task.append_sub_task(example_sub_task, self.workflow).initiate(0)
+        sub_task.sub_tasks[0].complete(1)
+        sub_task.complete(1)
+
+        self.perform_sub_task(example_sub_task, 1, 2)
+
+        self.assertEquals(2, len(self.task.compressed_sub_tasks))
+
+    def test_formatting_matches_uncompressed_tree(self):
+        uncompressed_task = Task(self.task.entry_point)
+        uncompressed_task.initiate(0)
+
+        for task in [self.task, uncompressed_task]:
+            for tick in range(0, 3):
+                sub_task = task.append_sub_task(example_sub_task, self.workflow)
+                sub_task.initiate(tick)
+                sub_task.complete(tick + 1)
+            task.complete(3)
+
+        self.assertEquals(format_task_trees([uncompressed_task]), format_task_trees([self.task]))
+
+
 if __name__ == '__main__':
     unittest.main()
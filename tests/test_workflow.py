@@ -0,0 +1,154 @@
+import unittest
+
+from theatre_ag import TaskQueueActor, SynchronizingClock, WorkflowPool, Idling, allocate_workflow_to, default_cost
+
+
+class Counter(object):
+
+    is_workflow = True
+
+    def __init__(self):
+        self.count = 0
+
+    @default_cost(1)
+    def increment(self, amount):
+        self.count += amount
+
+
+class ListingCounter(object):
+
+    is_workflow = True
+
+    observed = list()
+
+    def __init__(self):
+        self.items = list()
+
+    @default_cost(1)
+    def increment(self, amount):
+        self.items.append(amount)
+        ListingCounter.observed = list(self.items)
+
+
+class Delegating(object):
+
+    is_workflow = True
+
+    def __init__(self, colleague):
+        self.colleague = colleague
+        self.idling = Idling()
+
+    @default_cost(1)
+    def delegate(self):
+        self.idling.idle()
+
+
+class ResettingCounter(Counter):
+
+    def __init__(self):
+        super(ResettingCounter, self).__init__()
+        self.history = list()
+
+    @default_cost(1)
+    def increment(self, amount):
+        self.history.append(amount)
+
+    def reset(self):
+        del self.history[:]
+
+
+class WorkflowPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=4)
+        self.actor = TaskQueueActor('alice', self.clock)
+
+    def run_clock(self):
+        self.actor.initiate_shutdown()
+        self.actor.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+        self.actor.wait_for_shutdown()
+
+    def test_pooled_instances_prebound(self):
+
+        pool = WorkflowPool(self.actor, Counter(), size=2)
+
+        self.assertEqual(2, pool.available)
+        workflow = pool.acquire()
+        self.assertIs(self.actor, workflow.actor)
+        self.assertEqual(1, pool.available)
+
+    def test_instances_reset_and_reused(self):
+
+        pool = WorkflowPool(self.actor, Counter(), size=1)
+
+        first_task = pool.allocate_task('increment', [2])
+        self.run_clock()
+
+        self.assertEqual('increment(2)[0->1]', str(first_task))
+        self.assertEqual(1, pool.available)
+
+        workflow = pool.acquire()
+        self.assertIs(first_task.workflow, workflow)
+        self.assertEqual(0, workflow.count)
+
+    def test_mutable_state_reset(self):
+
+        pool = WorkflowPool(self.actor, ListingCounter(), size=1)
+
+        first_task = pool.allocate_task('increment', [2])
+        self.run_clock()
+
+        self.assertEqual([2], ListingCounter.observed)
+        self.assertIs(first_task.workflow, pool.acquire())
+        self.assertEqual([], first_task.workflow.items)
+
+    def test_allocated_prototype(self):
+
+        prototype = Counter()
+        allocate_workflow_to(self.actor, prototype)
+
+        pool = WorkflowPool(self.actor, prototype, size=2)
+
+        self.assertEqual(2, pool.available)
+        self.assertIsNot(prototype, pool.acquire())
+
+    def test_prototype_referring_to_other_actor(self):
+
+        bob = TaskQueueActor('bob', self.clock, register_with_clock=False)
+
+        pool = WorkflowPool(self.actor, Delegating(colleague=bob), size=1)
+        workflow = pool.acquire()
+
+        self.assertIs(bob, workflow.colleague)
+        self.assertIs(self.actor, workflow.idling.actor)
+
+    def test_prototype_allocated_to_other_actor(self):
+
+        bob = TaskQueueActor('bob', self.clock, register_with_clock=False)
+        prototype = Delegating(colleague=bob)
+        allocate_workflow_to(bob, prototype)
+
+        pool = WorkflowPool(self.actor, prototype, size=1)
+
+        first_task = pool.allocate_task('delegate')
+        self.run_clock()
+
+        self.assertIs(self.actor, first_task.workflow.actor)
+        self.assertIs(self.actor, first_task.workflow.idling.actor)
+        self.assertEqual(['idle()[1->2]'], [str(task) for task in first_task.sub_tasks])
+        self.assertIs(bob, prototype.idling.actor)
+
+    def test_reset_method(self):
+
+        pool = WorkflowPool(self.actor, ResettingCounter(), size=1)
+
+        pool.allocate_task('increment', [2])
+        self.run_clock()
+
+        self.assertEqual([], pool.acquire().history)
+
+
+if __name__ == '__main__':
+    unittest.main()
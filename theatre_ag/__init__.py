@@ -4,8 +4,20 @@
 
 from .actor import Actor, TaskQueueActor, Empty, OutOfTurnsException
 from .cast import Cast
+from .crowd import CrowdActor, CrowdMember, NestedWaitException
+from .directions import StreamedDirections
+from .columns import TaskColumns
 from .episode import Episode
-from .workflow import Idling, default_cost, allocate_workflow_to
-from .clock import SynchronizingClock
+from .events import EventStream, SimulationEvent, Subscription, TICK_STARTED, TICK_COMPLETED, TASK_INITIATED, \
+    TASK_COMPLETED, DROP, BLOCK
+from .ensemble import Ensemble, EnsembleProgress
+from .failures import AsyncFailureSink, FailureLog, FailureRecord
+from .workflow import Idling, WorkflowPool, default_cost, independent, allocate_workflow_to
+from .clock import SynchronizingClock, ChildClock
+from .mailbox import Mailbox, Message, PostOffice
+from .scene import Scene, first_write_wins, last_write_wins
+from .statistics import RunningStatistics, StatisticsCollector
 
 from .task import format_task_trees, Task
+from .watchdog import StallWatchdog, StallReport, StalledTickException
+from .tracing import TracingPolicy, TRACE_NONE, TRACE_TOP_LEVEL, TRACE_DEPTH_LIMITED, TRACE_FULL
@@ -5,13 +5,19 @@
 import sys
 
 from Queue import Queue, Empty
-from threading import Event, RLock, Thread
+from threading import Event, Lock, RLock, Thread
 
+from .events import TASK_COMPLETED, TASK_INITIATED
+from .failures import FailureLog
+from .mailbox import Mailbox
 from .task import Task
+from .tracing import FULL_TRACING
 from .workflow import allocate_workflow_to, Idling
 
 PYTHON_VERSION = sys.version[0]
 
+_lazy_resources_lock = Lock()
+
 
 class OutOfTurnsException(Exception):
     """
@@ -32,42 +38,183 @@ class Actor(object):
     """
 
     def __init__(self, logical_name, clock, *args, **kwargs):
+        """
+        Actors register themselves with their clock as tick listeners unless <code>register_with_clock=False</code> is
+        passed, in which case the creator must register the actor, for example with
+        <code>clock.add_tick_listeners</code>.  The actor's thread, synchronization events, lock, mailbox and idling
+        workflow are only created when first needed.
+        """
+        register_with_clock = kwargs.pop('register_with_clock', True)
+
         self.logical_name = logical_name
         self.clock = clock
+        self.sequence = clock.next_actor_sequence()
 
-        self.tick_received = Event()
-        self.tick_received.clear()
-        self.waiting_for_tick = Event()
-        self.waiting_for_tick.clear()
+        self._tick_received = None
+        self._waiting_for_tick = None
+        self._busy = None
 
-        self.busy = RLock()
         self.wait_for_directions = True
-        self.thread = Thread(target=self.perform)
+        self.thread = None
+
+        if register_with_clock:
+            self.clock.add_tick_listener(self)
+
+        self.initialise_task_state()
 
-        self.clock.add_tick_listener(self)
+        self._idling = None
+
+        super(Actor, self).__init__(*args, **kwargs)
+
+    def initialise_task_state(self):
+        """
+        Creates the state an actor needs to record and time its tasks, independently of its thread of control.
+        """
+        self._mailbox = None
 
         self._task_history = list()
         self.current_task = None
 
-        self.idling = Idling()
-        allocate_workflow_to(self, self.idling, logging=False)
+        self.tracing_policy = FULL_TRACING
+        self.statistics = None
+        self.failures = FailureLog()
+        self._failure_context = None
+        self.compress_task_runs = False
+        self._task_depth = 0
+        self._untraced_depth = 0
+        self._tracing_samples = dict()
 
         self.next_turn = 0
 
-        super(Actor, self).__init__(*args, **kwargs)
+    def lazy_resource(self, name, factory):
+        """
+        :return: the value of the named attribute, first setting it to the factory's result if it is None.  Creation is
+        guarded by a single lock shared by all actors, since resources may be first needed by the clock's thread.
+        """
+        value = getattr(self, name)
+        if value is None:
+            _lazy_resources_lock.acquire()
+            try:
+                value = getattr(self, name)
+                if value is None:
+                    value = factory()
+                    setattr(self, name, value)
+            finally:
+                _lazy_resources_lock.release()
+        return value
+
+    @property
+    def tick_received(self):
+        return self.lazy_resource('_tick_received', Event)
+
+    @property
+    def waiting_for_tick(self):
+        return self.lazy_resource('_waiting_for_tick', Event)
+
+    @property
+    def busy(self):
+        return self.lazy_resource('_busy', RLock)
+
+    @busy.setter
+    def busy(self, busy):
+        self._busy = busy
+
+    @property
+    def mailbox(self):
+        return self.lazy_resource('_mailbox', lambda: Mailbox(self, self.clock.post_office))
+
+    @property
+    def idling(self):
+        if self._idling is None:
+            self._idling = Idling()
+            allocate_workflow_to(self, self._idling, logging=False)
+        return self._idling
+
+    def tracing_policy_for(self, workflow):
+        """
+        :return: the tracing policy of the workflow's class if it declares one, otherwise the actor's tracing policy.
+        """
+        workflow_policy = getattr(type(workflow), 'tracing_policy', None)
+        return self.tracing_policy if workflow_policy is None else workflow_policy
+
+    def traces_sub_task(self, workflow):
+        policy = self.tracing_policy_for(workflow)
+        if not policy.admits_sub_task(self._task_depth + 1):
+            return False
+
+        sample_count = self._tracing_samples.get(policy, 0)
+        self._tracing_samples[policy] = sample_count + 1
+        return policy.samples(sample_count)
+
+    def begin_task(self, task):
+        if self.tracing_policy_for(task.workflow).records_tasks:
+            self._task_history.append(task)
+        self.current_task = task
+        task.compress_runs = self.compress_task_runs
+        self._task_depth = 0
+        self._untraced_depth = 0
+
+    def active_task_chain(self):
+        return list() if self.current_task is None else self.current_task.task_chain
+
+    def capture_failure_context(self, exception):
+        """
+        Notes the chain of active tasks when an exception is first raised through a synchronized workflow invocation,
+        before the chain is unwound.
+        """
+        if self._failure_context is None or self._failure_context[0] is not exception:
+            self._failure_context = (exception, self.active_task_chain())
+
+    def failure_task_chain(self, task, exception):
+        failure_context, self._failure_context = self._failure_context, None
+
+        if failure_context is not None and failure_context[0] is exception:
+            return failure_context[1]
+        elif self.current_task is not None:
+            return self.active_task_chain()
+        else:
+            return None if task is None else [str(task)]
+
+    def record_failure(self, task, exception):
+        task_chain = self.failure_task_chain(task, exception)
+        self.failures.record(self.logical_name, self.clock.current_tick, task, exception, task_chain)
+
+    def end_task(self, task):
+        workflow_pool = getattr(task.workflow, 'workflow_pool', None)
+        if workflow_pool is not None:
+            workflow_pool.release(task.workflow)
 
     def log_task_initiation(self, entry_point, workflow, args):
 
         if self.current_task is not None:
+            if self._untraced_depth > 0 or (self.current_task.initiated and not self.traces_sub_task(workflow)):
+                self._untraced_depth += 1
+                return
+
             if self.current_task.initiated:
-                self.current_task = self.current_task.append_sub_task(workflow, entry_point, args)
+                self.current_task = self.current_task.append_sub_task(entry_point, workflow, args)
+                self._task_depth += 1
 
-            self.current_task.initiate(self.clock.current_tick)
+            self.current_task.initiate(self.clock.global_tick)
+
+            if self.clock.event_stream.has_subscribers:
+                self.clock.event_stream.publish(TASK_INITIATED, self.clock.global_tick, self, self.current_task)
 
     def log_task_completion(self):
-        if self.current_task is not None:
-            self.current_task.complete(self.clock.current_tick)
-            self.current_task = self.current_task.parent
+        if self._untraced_depth > 0:
+            self._untraced_depth -= 1
+        elif self.current_task is not None:
+            completed_task = self.current_task
+            completed_task.complete(self.clock.global_tick)
+            self.current_task = completed_task.parent
+            self._task_depth -= 1
+
+            if self.statistics is not None:
+                self.statistics.record_task(
+                    completed_task, completed_task.parent is None, completed_task.workflow is self._idling)
+
+            if self.clock.event_stream.has_subscribers:
+                self.clock.event_stream.publish(TASK_COMPLETED, self.clock.global_tick, self, completed_task)
 
     @property
     def task_history(self):
@@ -108,8 +255,22 @@ class Actor(object):
 
         return recursive_task_count(self.task_history)
 
-    def handle_task_return(self, return_value):
-        pass
+    def send_message(self, receiver, content):
+        """
+        Buffers a message for the receiving actor.  The message is delivered when the current tick closes, so the
+        receiver can read it from the following tick onwards.
+        :raises ValueError: if the receiver listens to a different clock, since the message could not be delivered
+        while the receiver is waiting.
+        """
+        if receiver.clock is not self.clock:
+            raise ValueError("Actor [%s] cannot message actor [%s] on a different clock." % (self, receiver))
+        self.mailbox.post(receiver, content, self.clock.current_tick)
+
+    def receive_messages(self):
+        """
+        :return: all messages delivered to the actor since the last call, in deterministic delivery order.
+        """
+        return self.mailbox.drain()
 
     def get_next_task(self):
         """
@@ -139,6 +300,7 @@ class Actor(object):
         Repeatedly polls the actor's asynchronous work queue until the actor is shutdown.  Tasks in the work queue are
         executed synchronously until shutdown.  On shutdown, all remaining tasks in the queue are processed before
         termination.  Task execution will halt immediately if the actor's clock runs up to it's maximum tick count.
+        Exceptions raised by tasks are recorded in the actor's failure log.
         """
         while self.wait_for_directions or self.tasks_waiting():
             task = None
@@ -157,28 +319,32 @@ class Actor(object):
                     task = Task(self.idling.idle, self.idling)
 
                 if task is not None:
-                    self._task_history.append(task)
-                    self.current_task = task
+                    self.begin_task(task)
 
-                    return_value = task.entry_point(*task.args)
-                    self.handle_task_return(task, return_value)
+                    try:
+                        return_value = task.entry_point(*task.args)
+                        self.handle_task_return(task, return_value)
+                    finally:
+                        self.end_task(task)
 
             except OutOfTurnsException:
                 break
             except Exception as e:
-                if PYTHON_VERSION == '2':
-                    print >> sys.stderr, "Warning, actor [%s] encountered exception [%s], in workflow [%s]." % \
-                        (self.logical_name, str(e.message), str(task))
-                # else:
-                #     # Note: if you're using a python2 IDE this'll raise a syntax error, but it's valid in Python3!
-                #     print("Warning, actor [%s] encountered exception [%s], in workflow [%s]." % \
-                #         (self.logical_name, str(e), str(task)), file=sys.stderr)
+                self.record_failure(task, e)
 
         # Ensure that clock can proceed for other listeners.
         self.clock.remove_tick_listener(self)
         self.waiting_for_tick.set()
 
     def start(self):
+        """
+        Creates and starts the actor's thread.
+        :raises RuntimeError: if the actor has already been started.
+        """
+        if self.thread is not None:
+            raise RuntimeError("Actor [%s] has already been started." % self)
+
+        self.thread = Thread(target=self.perform)
         self.thread.start()
 
     def shutdown(self):
@@ -189,7 +355,8 @@ class Actor(object):
         self.wait_for_directions = False
 
     def wait_for_shutdown(self):
-        self.thread.join()
+        if self.thread is not None:
+            self.thread.join()
 
     # noinspection PyMethodMayBeStatic,PyMethodMayBeStatic
     def calculate_delay(self, entry_point):
@@ -227,6 +394,12 @@ class Actor(object):
         self.waiting_for_tick.clear()
         self.tick_received.set()
 
+    def __deepcopy__(self, memo):
+        """
+        Actors are shared, rather than copied, when the workflows that refer to them are deep copied.
+        """
+        return self
+
     def __str__(self):
         return "a_%s" % self.logical_name
 
@@ -239,16 +412,13 @@ class TaskQueueActor(Actor):
     A simple actor class that receives executable tasks into a priority queue.
     """
 
-    def __init__(self, logical_name,  clock):
-        super(TaskQueueActor, self).__init__(logical_name, clock)
+    def __init__(self, logical_name,  clock, **kwargs):
+        super(TaskQueueActor, self).__init__(logical_name, clock, **kwargs)
         self.task_queue = Queue()
 
     def get_next_task(self):
         return self.task_queue.get(block=False)
 
-    def handle_task_return(self, return_value):
-        pass
-
     def tasks_waiting(self):
         return not self.task_queue.empty()
 
@@ -2,6 +2,11 @@
 @author twsswt
 """
 
+from .actor import TaskQueueActor
+from .columns import TaskColumns
+from .failures import FailureLog
+from .statistics import StatisticsCollector
+
 
 class Cast(object):
     """
@@ -14,6 +19,16 @@ class Cast(object):
     def add_member(self, actor):
         self.members.add(actor)
 
+    @staticmethod
+    def assemble(clock, logical_names, actor_class=TaskQueueActor):
+        """
+        Creates a cast with an actor of the specified class for each logical name, registering all of the actors with the
+        clock in a single batch.
+        """
+        actors = [actor_class(logical_name, clock, register_with_clock=False) for logical_name in logical_names]
+        clock.add_tick_listeners(actors)
+        return Cast(actors)
+
     def improvise(self, directions):
         directions.apply(self.members)
 
@@ -51,3 +66,24 @@ class Cast(object):
 
     def task_count(self, task_filter):
         return sum(map(lambda actor: actor.task_count(task_filter), self.members))
+
+    def task_columns(self):
+        """
+        :return: the task histories of all members flattened into a <code>TaskColumns</code> object.
+        """
+        return TaskColumns.from_cast(self)
+
+    @property
+    def statistics(self):
+        """
+        :return: a collector merging the statistics collected so far by all members that have a statistics collector.
+        """
+        return StatisticsCollector.merged(
+            [actor.statistics for actor in list(self.members) if actor.statistics is not None])
+
+    @property
+    def failures(self):
+        """
+        :return: a failure log merging the failures recorded so far by all members.
+        """
+        return FailureLog.merged([actor.failures for actor in list(self.members)])
@@ -2,27 +2,60 @@
 @author twsswt
 """
 
+import itertools
+import time
+
 from threading import Thread, Lock
 
+from .events import EventStream, TICK_COMPLETED, TICK_STARTED
+from .mailbox import PostOffice
+from .watchdog import StalledTickException
+
 
 class SynchronizingClock(object):
 
-    def __init__(self, max_ticks=1):
+    def __init__(self, max_ticks=1, watchdog=None):
         self.max_ticks = max_ticks
+        self.watchdog = watchdog
 
         self._ticks = 0
+        self._actor_sequence = itertools.count()
 
         self._tick_listeners = list()
         self._tick_listeners_lock = Lock()
 
+        self._tick_boundary_listeners = list()
+
+        self.post_office = PostOffice()
+        self.add_tick_boundary_listener(self.post_office)
+
+        self.event_stream = EventStream()
+        self.add_tick_boundary_listener(self.event_stream)
+
         self.issue_ticks = True
 
         self._thread = Thread(target=self.tick_toc)
 
+    def next_actor_sequence(self):
+        """
+        :return: a sequence number identifying an actor created on the clock, that orders actors by creation.
+        """
+        return next(self._actor_sequence)
+
     @property
     def current_tick(self):
         return self._ticks
 
+    @property
+    def global_tick(self):
+        """
+        :return: the current tick expressed on the timeline of the root clock in a clock hierarchy.
+        """
+        return self.global_tick_at(self.current_tick)
+
+    def global_tick_at(self, tick):
+        return tick
+
     @property
     def will_tick_again(self):
         return self.current_tick < self.max_ticks and self.issue_ticks
@@ -42,23 +75,112 @@ class SynchronizingClock(object):
         self._tick_listeners.append(listener)
         self._tick_listeners_lock.release()
 
+    def add_tick_listeners(self, listeners):
+        """
+        Registers a batch of tick listeners while acquiring the listener lock once.
+        """
+        self._tick_listeners_lock.acquire()
+        self._tick_listeners.extend(listeners)
+        self._tick_listeners_lock.release()
+
     def remove_tick_listener(self, listener):
         self._tick_listeners_lock.acquire()
         self._tick_listeners.remove(listener)
         self._tick_listeners_lock.release()
 
+    def add_tick_boundary_listener(self, listener):
+        """
+        Registers a listener whose <code>close_tick</code> method is invoked with the closing tick once all tick
+        listeners are waiting, and before the next tick is issued.
+        """
+        self._tick_listeners_lock.acquire()
+        self._tick_boundary_listeners.append(listener)
+        self._tick_listeners_lock.release()
+
+    def remove_tick_boundary_listener(self, listener):
+        self._tick_listeners_lock.acquire()
+        self._tick_boundary_listeners.remove(listener)
+        self._tick_listeners_lock.release()
+
     def tick(self):
         """
-        Issues a tick once all registered tick listeners are waiting for them.
+        Issues a tick once all registered tick listeners are waiting for them.  If the clock's watchdog aborts on a
+        stalled tick, the clock instead stops issuing ticks and releases the listeners that are waiting.
+        """
+        try:
+            cached_listeners = self.wait_for_tick_listeners()
+        except StalledTickException:
+            self.abort_ticks()
+        else:
+            self.issue_tick(cached_listeners)
+
+    def abort_ticks(self):
         """
+        Stops issuing ticks and releases the tick listeners, aborting the ticks of any child clocks among them.
+        """
+        self.issue_ticks = False
+
         self._tick_listeners_lock.acquire()
         cached_tick_listeners = list(self._tick_listeners)
         self._tick_listeners_lock.release()
+
         for tick_listener in cached_tick_listeners:
-            tick_listener.waiting_for_tick.wait()
+            if isinstance(tick_listener, SynchronizingClock):
+                tick_listener.abort_ticks()
+            else:
+                tick_listener.notify_new_tick()
+
+    def cache_listeners(self):
+        """
+        :return: the currently registered tick listeners and tick boundary listeners.
+        """
+        self._tick_listeners_lock.acquire()
+        cached_tick_listeners = list(self._tick_listeners)
+        cached_tick_boundary_listeners = list(self._tick_boundary_listeners)
+        self._tick_listeners_lock.release()
+        return cached_tick_listeners, cached_tick_boundary_listeners
+
+    def wait_for_tick_listeners(self):
+        """
+        Blocks until all registered tick listeners are waiting for the next tick.
+        :return: the tick listeners and tick boundary listeners registered when the wait began.
+        """
+        cached_tick_listeners, cached_tick_boundary_listeners = self.cache_listeners()
+
+        if self.watchdog is None:
+            for tick_listener in cached_tick_listeners:
+                tick_listener.waiting_for_tick.wait()
+        else:
+            self.watchdog.watch(self, cached_tick_listeners)
+
+        return cached_tick_listeners, cached_tick_boundary_listeners
+
+    def issue_tick(self, cached_listeners):
+        """
+        Closes the current tick and notifies the cached tick listeners of the next one.
+        """
+        cached_tick_listeners, cached_tick_boundary_listeners = cached_listeners
+
+        self.close_current_tick(cached_tick_boundary_listeners)
+        self.notify_tick_listeners(cached_tick_listeners)
+
+    def close_current_tick(self, cached_tick_boundary_listeners):
+        """
+        Invokes the tick boundary listeners for the current tick and advances the clock.  Tick listeners must all be
+        waiting when the current tick is closed.
+        """
+        if self.event_stream.has_subscribers:
+            self.event_stream.publish(TICK_COMPLETED, self.global_tick)
+
+        for tick_boundary_listener in cached_tick_boundary_listeners:
+            tick_boundary_listener.close_tick(self.current_tick)
 
         self._ticks += 1
 
+        if self.event_stream.has_subscribers:
+            self.event_stream.publish(TICK_STARTED, self.global_tick)
+
+    def notify_tick_listeners(self, cached_tick_listeners):
         for tick_listener in cached_tick_listeners:
             tick_listener.notify_new_tick()
 
@@ -66,5 +188,116 @@ class SynchronizingClock(object):
         while self.issue_ticks and self.current_tick < self.max_ticks:
             self.tick()
 
+    def __deepcopy__(self, memo):
+        return self
+
     def __str__(self):
         return "c(%d of %d)" % (self.current_tick, self.max_ticks)
+
+
+class ChildClockBarrier(object):
+    """
+    Stands in for a tick listener's <code>waiting_for_tick</code> event when a child clock listens to its parent.  The
+    parent only blocks on the child's listeners when the parent's next tick is also one of the child's ticks.  Waits
+    with a timeout wait on the child's listeners for the remaining time, so that a parent clock's watchdog can detect
+    stalls on child clocks.
+    """
+
+    def __init__(self, child_clock):
+        self.child_clock = child_clock
+        self.cached_listeners = None
+        self._pending_listeners = None
+
+    def pending_listeners(self):
+        if self._pending_listeners is None:
+            self._pending_listeners = self.child_clock.cache_listeners()
+        return self._pending_listeners
+
+    def pending_tick_listeners(self):
+        """
+        :return: the child's tick listeners that the parent must wait for before its next tick.
+        """
+        if not self.child_clock.ticks_with_next_parent_tick:
+            return list()
+        return self.pending_listeners()[0]
+
+    def is_set(self):
+        for tick_listener in self.pending_tick_listeners():
+            if not tick_listener.waiting_for_tick.is_set():
+                return False
+        return True
+
+    def wait(self, timeout=None):
+        if not self.child_clock.ticks_with_next_parent_tick:
+            return True
+
+        if timeout is None:
+            self._pending_listeners = None
+            self.cached_listeners = self.child_clock.wait_for_tick_listeners()
+            return True
+
+        deadline = time.time() + timeout
+        for tick_listener in self.pending_tick_listeners():
+            if not tick_listener.waiting_for_tick.wait(max(deadline - time.time(), 0)):
+                return False
+
+        self.cached_listeners, self._pending_listeners = self._pending_listeners, None
+        return True
+
+
+class ChildClock(SynchronizingClock):
+    """
+    A clock that ticks once every <code>period</code> ticks of its parent clock.  Actors listening to a child clock only
+    join the parent's tick barrier on the child's own ticks, so coarse grained actors do not need to synchronize on
+    every fine grained tick.  Child clocks are driven by their parent and so are not started independently.  Task start
+    and finish ticks are recorded on the root clock's timeline via <code>global_tick</code>.
+
+    A child clock closes its ticks as one of its parent's tick boundary listeners, so the child's own boundary
+    listeners run while the listeners of every clock in the hierarchy are waiting at the root clock's barrier.
+    Mailboxes and scenes belong to a single clock: actors may only send messages to, and write to the scenes of, the
+    clock they listen to.
+    """
+
+    def __init__(self, parent, period, watchdog=None):
+        super(ChildClock, self).__init__(max_ticks=parent.max_ticks // period, watchdog=watchdog)
+
+        self.parent = parent
+        self.period = period
+
+        self.waiting_for_tick = ChildClockBarrier(self)
+        self.parent.add_tick_listener(self)
+        self.parent.add_tick_boundary_listener(self)
+
+    @property
+    def will_tick_again(self):
+        return super(ChildClock, self).will_tick_again and self.parent.will_tick_again
+
+    @property
+    def ticks_with_next_parent_tick(self):
+        return self.issue_ticks and (self.parent.current_tick + 1) % self.period == 0
+
+    def global_tick_at(self, tick):
+        return self.parent.global_tick_at(tick * self.period)
+
+    def close_tick(self, parent_tick):
+        cached_listeners = self.waiting_for_tick.cached_listeners
+        if cached_listeners is not None:
+            self.close_current_tick(cached_listeners[1])
+
+    def notify_new_tick(self):
+        cached_listeners = self.waiting_for_tick.cached_listeners
+        if cached_listeners is not None:
+            self.waiting_for_tick.cached_listeners = None
+            self.notify_tick_listeners(cached_listeners[0])
+
+    def start(self):
+        pass
+
+    def shutdown(self):
+        self.issue_ticks = False
+
+    def wait_for_last_tick(self):
+        self.parent.wait_for_last_tick()
+
+    def __str__(self):
+        return "c(%d of %d every %d of %s)" % (self.current_tick, self.max_ticks, self.period, self.parent)
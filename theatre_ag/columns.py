@@ -0,0 +1,171 @@
+"""
+@author twsswt
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NO_TICK = -1
+NO_PARENT = -1
+
+TASK_COLUMNS = [
+    ('actor', 'i4'),
+    ('entry_point', 'i4'),
+    ('depth', 'i4'),
+    ('parent', 'i8'),
+    ('start_tick', 'i8'),
+    ('finish_tick', 'i8'),
+    ('args_hash', 'i8')
+]
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("Task columns require numpy to be installed.")
+
+
+def args_hash(args):
+    try:
+        return hash(tuple(args))
+    except TypeError:
+        return hash(repr(args))
+
+
+class TaskColumns(object):
+    """
+    A columnar representation of the task forest of a cast, held as a structured NumPy array with one row per task in
+    depth first order.  Actors and entry points are stored as indices into the <code>actors</code> and
+    <code>entry_points</code> name tables, parents as row indices (NO_PARENT for top level tasks) and ticks that have
+    not yet occurred as NO_TICK.  Queries over the columns are vectorized equivalents of the corresponding Cast
+    methods.
+    """
+
+    def __init__(self, tasks, actors, entry_points):
+        _require_numpy()
+        self.tasks = tasks
+        self.actors = list(actors)
+        self.entry_points = list(entry_points)
+
+    @staticmethod
+    def from_cast(cast):
+        """
+        Flattens the task histories of the cast's members in a single pass.
+        """
+        _require_numpy()
+
+        actors = sorted(cast.members, key=str)
+        entry_point_indices = dict()
+        entry_points = list()
+        rows = list()
+
+        for actor_index, actor in enumerate(actors):
+            stack = [(task, 0, NO_PARENT) for task in reversed(actor.task_history)]
+            while len(stack) > 0:
+                task, depth, parent = stack.pop()
+
+                entry_point = task.entry_point_key
+                entry_point_index = entry_point_indices.get(entry_point)
+                if entry_point_index is None:
+                    entry_point_index = entry_point_indices[entry_point] = len(entry_points)
+                    entry_points.append(entry_point)
+
+                row = len(rows)
+                rows.append((
+                    actor_index,
+                    entry_point_index,
+                    depth,
+                    parent,
+                    NO_TICK if task.start_tick is None else task.start_tick,
+                    NO_TICK if task.finish_tick is None else task.finish_tick,
+                    args_hash(task.args)))
+
+                for sub_task in reversed(task.sub_tasks):
+                    stack.append((sub_task, depth + 1, row))
+
+        return TaskColumns(numpy.array(rows, dtype=TASK_COLUMNS), [str(actor) for actor in actors], entry_points)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def save(self, prefix):
+        """
+        Writes the columns to <prefix>.tasks.npy, <prefix>.actors.npy and <prefix>.entry_points.npy.
+        """
+        numpy.save(prefix + '.tasks.npy', self.tasks)
+        numpy.save(prefix + '.actors.npy', numpy.array(self.actors, dtype=numpy.unicode_))
+        numpy.save(prefix + '.entry_points.npy', numpy.array(self.entry_points, dtype=numpy.unicode_))
+
+    @staticmethod
+    def load(prefix, mmap_mode='r'):
+        """
+        Loads columns written by <code>save</code>, memory mapping the task rows by default.
+        """
+        _require_numpy()
+        return TaskColumns(
+            numpy.load(prefix + '.tasks.npy', mmap_mode=mmap_mode),
+            [str(name) for name in numpy.load(prefix + '.actors.npy')],
+            [str(name) for name in numpy.load(prefix + '.entry_points.npy')])
+
+    def to_arrow(self):
+        """
+        :return: the columns as a pyarrow Table with actor and entry point names dictionary encoded.
+        """
+        import pyarrow
+
+        columns = dict((name, pyarrow.array(self.tasks[name])) for name, _ in TASK_COLUMNS)
+        columns['actor'] = pyarrow.DictionaryArray.from_arrays(columns['actor'], pyarrow.array(self.actors))
+        columns['entry_point'] = \
+            pyarrow.DictionaryArray.from_arrays(columns['entry_point'], pyarrow.array(self.entry_points))
+
+        return pyarrow.Table.from_arrays([columns[name] for name, _ in TASK_COLUMNS], [name for name, _ in TASK_COLUMNS])
+
+    def save_arrow(self, path):
+        """
+        Writes the columns to an Arrow IPC file that can be memory mapped with <code>pyarrow.memory_map</code>.
+        """
+        import pyarrow
+
+        table = self.to_arrow()
+        sink = pyarrow.OSFile(path, 'wb')
+        try:
+            writer = pyarrow.RecordBatchFileWriter(sink, table.schema)
+            writer.write_table(table)
+            writer.close()
+        finally:
+            sink.close()
+
+    def mask(self, entry_points=None, actors=None, max_depth=None):
+        """
+        :return: a boolean array selecting the tasks of the named entry points and actors, up to the maximum depth.
+        """
+        selected = numpy.ones(len(self.tasks), dtype=bool)
+
+        if entry_points is not None:
+            indices = [self.entry_points.index(name) for name in entry_points if name in self.entry_points]
+            selected &= numpy.in1d(self.tasks['entry_point'], indices)
+
+        if actors is not None:
+            indices = [self.actors.index(str(actor)) for actor in actors if str(actor) in self.actors]
+            selected &= numpy.in1d(self.tasks['actor'], indices)
+
+        if max_depth is not None:
+            selected &= self.tasks['depth'] <= max_depth
+
+        return selected
+
+    def task_count(self, entry_points=None, actors=None, max_depth=None):
+        return int(numpy.count_nonzero(self.mask(entry_points, actors, max_depth)))
+
+    @property
+    def last_tick(self):
+        """
+        :return: the latest tick at which any task was started or finished, or 0 if no tasks have been recorded.
+        """
+        if len(self.tasks) == 0:
+            return 0
+
+        finish_ticks = self.tasks['finish_tick']
+        ticks = numpy.where(finish_ticks != NO_TICK, finish_ticks, self.tasks['start_tick'])
+        return max(0, int(ticks.max()))
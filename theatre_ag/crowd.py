@@ -0,0 +1,365 @@
+"""
+@author twsswt
+"""
+
+import pickle
+
+from collections import deque
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+from .actor import Actor, OutOfTurnsException
+from .task import Task
+from .workflow import allocate_workflow_to, is_independent, unbind_workflow, unbound_state_of
+
+
+COMPLETED = 'completed'
+FAILED = 'failed'
+NESTED = 'nested'
+
+
+class NestedCallException(Exception):
+    pass
+
+
+class NestedCallDetector(object):
+    """
+    Stands in for an actor in a worker process, noting when an independent task makes a synchronized nested call,
+    which must be timed and recorded by the task's real actor.
+    """
+
+    def __init__(self):
+        self.busy = self
+        self.nested_call = False
+
+    def acquire(self):
+        pass
+
+    def release(self):
+        pass
+
+    def log_task_initiation(self, entry_point, workflow, args):
+        self.nested_call = True
+        raise NestedCallException()
+
+
+def picklable_exception(exception):
+    try:
+        pickle.dumps(exception, pickle.HIGHEST_PROTOCOL)
+        return exception
+    except Exception:
+        return Exception("%s: %s" % (type(exception).__name__, exception))
+
+
+def perform_independent_task(pickled_task):
+    """
+    Performs an independent task in a worker process, on a copy of the task's workflow that is not bound to an actor.
+    :return: COMPLETED with the task's return value and the workflow's resulting state, FAILED with the exception the
+    task raised, or NESTED if the task made a synchronized nested call and so must be performed by its actor instead.
+    """
+    workflow_class, workflow_state, entry_point_name, args = pickle.loads(pickled_task)
+
+    workflow = workflow_class.__new__(workflow_class)
+    workflow.__dict__.update(workflow_state)
+
+    detector = NestedCallDetector()
+    allocate_workflow_to(detector, workflow, logging=False)
+    try:
+        return_value = workflow.__getattribute__(entry_point_name, ordinary_lookup=True)(*args)
+    except Exception as e:
+        if detector.nested_call:
+            return NESTED, None, None
+        return FAILED, picklable_exception(e), None
+    finally:
+        unbind_workflow(workflow, detector)
+
+    if detector.nested_call:
+        return NESTED, None, None
+    return COMPLETED, return_value, unbound_state_of(workflow)
+
+
+class NestedWaitException(Exception):
+    """
+    Raised when a crowd member must wait for a later tick part way through a task, but cannot be suspended because
+    greenlet is not installed.
+    """
+
+    def __init__(self, member, task, tick):
+        self.member = member
+        self.task = task
+        self.tick = tick
+
+    def __str__(self):
+        return "Crowd member [%s] cannot wait for tick [%d] part way through task [%s] without greenlet installed." % \
+            (self.member, self.tick, self.task)
+
+
+class CrowdMember(Actor):
+    """
+    A lightweight logical actor performed by a crowd.  A crowd member has its own next turn, task queue and task
+    history, but no thread, events or idling workflow of its own.  Tasks are allocated to crowd members in the same
+    way as to a <code>TaskQueueActor</code>.
+
+    Each pending task is performed in its own greenlet, so that a member that must wait for a later tick part way
+    through a task, for example in <code>Idling.idle_for</code>, is suspended while the rest of the crowd carries on.
+    Without greenlet, such a task fails with a <code>NestedWaitException</code> rather than holding up the crowd.
+    """
+
+    # noinspection PyMissingConstructor
+    def __init__(self, logical_name, crowd):
+        self.logical_name = logical_name
+        self.clock = crowd.clock
+        self.sequence = self.clock.next_actor_sequence()
+        self.crowd = crowd
+        self.busy = crowd.busy
+        self._idling = None
+
+        self.initialise_task_state()
+
+        self.task_queue = deque()
+        self.pending_task = None
+        self.pending_entry_point = None
+        self.pending_greenlet = None
+
+    def allocate_task(self, entry_point=None, workflow=None, args=list()):
+        allocated_task = Task(entry_point, workflow, args)
+        self.task_queue.append(allocated_task)
+        return allocated_task
+
+    def tasks_waiting(self):
+        return self.pending_task is not None or len(self.task_queue) > 0
+
+    def record_failure(self, task, exception):
+        """
+        Records the failure in both the member's and the crowd's failure logs.
+        """
+        task_chain = self.failure_task_chain(task, exception)
+        for failures in [self.failures, self.crowd.failures]:
+            failures.record(self.logical_name, self.clock.current_tick, task, exception, task_chain)
+
+    @property
+    def suspended(self):
+        return self.pending_greenlet is not None
+
+    def wait_for_turn(self):
+        """
+        Suspends the member's pending task until the member's next turn, returning control to the crowd.
+        :raises NestedWaitException: if the member's next turn is in a later tick and greenlet is not installed.
+        """
+        if self.clock.current_tick >= self.next_turn:
+            return
+
+        if greenlet is None:
+            raise NestedWaitException(self, self.pending_task, self.next_turn)
+
+        while self.clock.current_tick < self.next_turn:
+            self.pending_greenlet.parent.switch()
+
+    def take_turn(self, independent_batch=None):
+        """
+        Starts the member's next task if it has none pending, and performs its pending task if the task's cost has been
+        incurred by the current tick, repeating until the member must wait for a later tick.  The cost of a task's entry
+        point is incurred before the task is performed without blocking the crowd.  If a batch is supplied and the
+        crowd has a process pool, a pending independent task is added to the batch instead of being performed.
+        """
+        current_tick = self.clock.current_tick
+
+        while True:
+            if self.pending_task is None:
+                if len(self.task_queue) == 0 or self.next_turn > current_tick:
+                    return
+                self.start_next_task()
+
+            if self.next_turn > current_tick:
+                return
+
+            if independent_batch is not None and self.crowd.process_pool is not None and not self.suspended and \
+                    is_independent(self.pending_entry_point, self.pending_task.workflow):
+                independent_batch.append(self)
+                return
+
+            self.perform_pending_task()
+
+            if self.suspended:
+                return
+
+    def start_next_task(self):
+        task = self.task_queue.popleft()
+
+        allocate_workflow_to(self, task.workflow)
+        entry_point_name = task.entry_point.__name__
+        task.entry_point = task.workflow.__getattribute__(entry_point_name)
+        self.pending_entry_point = task.workflow.__getattribute__(entry_point_name, ordinary_lookup=True)
+
+        self.begin_task(task)
+        self.log_task_initiation(self.pending_entry_point, task.workflow, task.args)
+        self.incur_delay(self.calculate_delay(self.pending_entry_point))
+
+        self.pending_task = task
+
+    def perform_pending_task(self):
+        """
+        Performs the pending task, or resumes it if it is suspended, until it completes or is suspended again.
+        """
+        if greenlet is None:
+            self.run_pending_task()
+            return
+
+        if self.pending_greenlet is None:
+            self.pending_greenlet = greenlet.greenlet(self.run_pending_task)
+        try:
+            self.pending_greenlet.switch()
+        finally:
+            if self.pending_greenlet.dead:
+                self.pending_greenlet = None
+
+    def run_pending_task(self):
+        try:
+            return_value = self.pending_entry_point(*self.pending_task.args)
+        except OutOfTurnsException:
+            raise
+        except Exception as e:
+            self.fail_pending_task(e)
+        else:
+            self.complete_pending_task(return_value)
+
+    def complete_pending_task(self, return_value):
+        task, self.pending_task = self.pending_task, None
+
+        self.log_task_completion()
+        try:
+            self.handle_task_return(task, return_value)
+        finally:
+            self.end_task(task)
+
+    def fail_pending_task(self, exception):
+        task, self.pending_task = self.pending_task, None
+
+        self.record_failure(task, exception)
+        self.log_task_completion()
+        self.end_task(task)
+
+    def start(self):
+        pass
+
+    def initiate_shutdown(self):
+        pass
+
+    def wait_for_shutdown(self):
+        pass
+
+
+class CrowdActor(Actor):
+    """
+    Performs the tasks of many lightweight logical actors on a single thread, registering a single tick listener with
+    the clock for the whole crowd.  On each tick, the crowd gives a turn to each member in the order the members were
+    added.  Members waiting for a later tick part way through a task are suspended, so the crowd records the same ticks
+    as the equivalent set of separate actors.
+
+    If the crowd is given a process pool, the independent tasks (see <code>workflow.independent</code>) that members
+    are due to perform in a tick are collected into a batch and performed together in the pool.  Each task is performed
+    on a copy of its workflow that is not bound to an actor, and the task's return value and resulting workflow state,
+    or the exception it raised, are applied back to the member in member order.  Tasks whose workflows cannot be
+    pickled, and tasks that make synchronized nested calls, which must be timed and recorded, are performed on the
+    crowd's thread instead, so that a crowd records the same ticks with or without a process pool.
+    """
+
+    def __init__(self, logical_name, clock, process_pool=None, **kwargs):
+        super(CrowdActor, self).__init__(logical_name, clock, **kwargs)
+        self.members = list()
+        self.process_pool = process_pool
+
+    def add_member(self, logical_name):
+        member = CrowdMember(logical_name, self)
+        self.members.append(member)
+        return member
+
+    def tasks_waiting(self):
+        for member in self.members:
+            if member.tasks_waiting():
+                return True
+        return False
+
+    def wait_until(self, tick):
+        self.next_turn = max(self.next_turn, tick)
+        self.wait_for_turn()
+
+    def perform_independent_batch(self, independent_batch):
+        pickled_tasks = list()
+        pooled_members = list()
+
+        for member in independent_batch:
+            task = member.pending_task
+            try:
+                pickled_tasks.append(pickle.dumps(
+                    (type(task.workflow), unbound_state_of(task.workflow), task.entry_point.__name__, task.args),
+                    pickle.HIGHEST_PROTOCOL))
+                pooled_members.append(member)
+            except Exception:
+                member.perform_pending_task()
+
+        if len(pickled_tasks) == 0:
+            return
+
+        results = self.process_pool.map(perform_independent_task, pickled_tasks)
+
+        for member, (outcome, value, workflow_state) in zip(pooled_members, results):
+            if outcome == COMPLETED:
+                member.pending_task.workflow.__dict__.update(workflow_state)
+                member.complete_pending_task(value)
+            elif outcome == FAILED:
+                member.fail_pending_task(value)
+            else:
+                member.perform_pending_task()
+
+    def take_turns(self):
+        members = self.members
+        while len(members) > 0:
+            independent_batch = None if self.process_pool is None else list()
+
+            for member in members:
+                try:
+                    member.take_turn(independent_batch)
+                except OutOfTurnsException:
+                    raise
+                except Exception as e:
+                    member.record_failure(member.current_task, e)
+
+            if independent_batch is None:
+                return
+
+            try:
+                self.perform_independent_batch(independent_batch)
+            except Exception as e:
+                for member in independent_batch:
+                    if member.pending_task is not None:
+                        member.fail_pending_task(e)
+
+            members = independent_batch
+
+    def perform(self):
+        """
+        Gives each member a turn on every tick until the crowd is shutdown and no member has tasks waiting, or the clock
+        runs out of ticks.
+        """
+        try:
+            while self.wait_for_directions or self.tasks_waiting():
+                self.take_turns()
+                self.wait_until(self.clock.current_tick + 1)
+
+        except OutOfTurnsException:
+            pass
+
+        self.clock.remove_tick_listener(self)
+        self.waiting_for_tick.set()
+
+    @property
+    def task_history(self):
+        return [task for member in self.members for task in member.task_history]
+
+    @property
+    def last_tick(self):
+        return max([0] + [member.last_tick for member in self.members])
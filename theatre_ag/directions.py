@@ -0,0 +1,56 @@
+"""
+@author twsswt
+"""
+
+import csv
+import json
+
+
+def read_jsonl_directions(path):
+    with open(path) as directions_file:
+        for line in directions_file:
+            if line.strip() != '':
+                yield json.loads(line)
+
+
+def read_csv_directions(path):
+    with open(path) as directions_file:
+        for row in csv.DictReader(directions_file):
+            row['args'] = json.loads(row['args']) if row.get('args') else list()
+            yield row
+
+
+class StreamedDirections(object):
+    """
+    Directions that allocate initial tasks to a cast's members from a file, reading one direction at a time rather than
+    loading the whole file.  Each direction names an actor, a workflow, an entry point into the workflow and a list of
+    arguments.  In JSONL files each line is an object with 'actor', 'workflow', 'entry_point' and 'args' members.  CSV
+    files have a header row with the same column names, and the args column holds a JSON encoded list.
+
+    Workflow names are resolved through the <code>workflows</code> dictionary, whose values are workflow classes or
+    other factories invoked to create a new workflow instance for each direction.  Actors are matched on the string
+    form of their logical names.
+    """
+
+    def __init__(self, path, workflows, file_format=None):
+        self.path = path
+        self.workflows = workflows
+
+        if file_format is None:
+            file_format = 'csv' if path.endswith('.csv') else 'jsonl'
+        self.file_format = file_format
+
+    def directions(self):
+        if self.file_format == 'csv':
+            return read_csv_directions(self.path)
+        else:
+            return read_jsonl_directions(self.path)
+
+    def apply(self, members):
+        actors = dict((str(actor.logical_name), actor) for actor in members)
+
+        for direction in self.directions():
+            actor = actors[str(direction['actor'])]
+            workflow = self.workflows[direction['workflow']]()
+            entry_point = workflow.__getattribute__(direction['entry_point'])
+            actor.allocate_task(entry_point, workflow, direction.get('args') or list())
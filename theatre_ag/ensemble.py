@@ -0,0 +1,151 @@
+"""
+@author twsswt
+"""
+
+import math
+import random
+
+from multiprocessing import Pool
+
+from .statistics import RunningStatistics
+
+
+def normal_quantile(p):
+    """
+    :return: the value z such that a standard normal variable falls below z with probability p.
+    """
+    low, high = -10.0, 10.0
+    for _ in range(0, 100):
+        middle = (low + high) / 2
+        if 0.5 * (1 + math.erf(middle / math.sqrt(2))) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def perform_replication(episode_factory, metrics, seed):
+    """
+    Creates an episode for the seed, performs it until the clock's last tick and all actors have stopped, and then
+    measures each metric on the completed episode.
+    """
+    episode = episode_factory(seed)
+    episode.perform()
+    episode.cast.wait_for_shutdown()
+    return dict((name, metric(episode)) for name, metric in metrics.items())
+
+
+def _perform_replication(arguments):
+    return perform_replication(*arguments)
+
+
+class EnsembleProgress(object):
+    """
+    A snapshot of an ensemble's metric summaries and confidence interval widths after a number of replications.
+    """
+
+    def __init__(self, replications, summaries, interval_widths, converged):
+        self.replications = replications
+        self.summaries = summaries
+        self.interval_widths = interval_widths
+        self.converged = converged
+
+    def __repr__(self):
+        return "ensemble(n=%d, converged=%s, widths=%s)" % (self.replications, self.converged, self.interval_widths)
+
+
+class Ensemble(object):
+    """
+    Performs replications of an episode until the confidence intervals of the means of a set of metrics are narrower
+    than a target width.  The episode factory is invoked with an independent seed for each replication and must
+    return a new Episode.  Metrics are a dictionary of names to functions of a performed episode, for example
+    <code>lambda episode: episode.cast.last_tick</code>.  Target widths may be a single value for all metrics or a
+    dictionary of widths by metric name.
+
+    Replications are performed in the calling process when workers is 1, and otherwise in a pool of worker processes,
+    in which case the episode factory and metrics must be picklable, module level functions.
+    """
+
+    def __init__(self, episode_factory, metrics, target_width, confidence=0.95, min_replications=10,
+                 max_replications=1000, workers=1, seed=None):
+        self.episode_factory = episode_factory
+        self.metrics = metrics
+        self.target_width = target_width
+        self.confidence = confidence
+        self.min_replications = min_replications
+        self.max_replications = max_replications
+        self.workers = workers
+
+        self._seeds = random.Random(seed)
+        self._z = normal_quantile(0.5 + confidence / 2)
+
+        self.replications = 0
+        self.summaries = dict((name, RunningStatistics()) for name in metrics)
+
+    def target_width_of(self, name):
+        return self.target_width[name] if isinstance(self.target_width, dict) else self.target_width
+
+    def interval_width(self, name):
+        variance = self.summaries[name].variance
+        if variance is None:
+            return None
+        return 2 * self._z * math.sqrt(variance / self.summaries[name].count)
+
+    @property
+    def converged(self):
+        if self.replications < self.min_replications:
+            return False
+
+        for name in self.metrics:
+            width = self.interval_width(name)
+            if width is None or width > self.target_width_of(name):
+                return False
+        return True
+
+    @property
+    def progress(self):
+        interval_widths = dict((name, self.interval_width(name)) for name in self.metrics)
+        summaries = dict((name, RunningStatistics().merge(summary)) for name, summary in self.summaries.items())
+        return EnsembleProgress(self.replications, summaries, interval_widths, self.converged)
+
+    def record(self, measurements):
+        self.replications += 1
+        for name, value in measurements.items():
+            self.summaries[name].record(value)
+
+    def next_seeds(self, count):
+        count = min(count, self.max_replications - self.replications)
+        return [self._seeds.randint(0, 2 ** 31 - 1) for _ in range(0, count)]
+
+    def iterate(self):
+        """
+        Performs replications until the metrics converge or the maximum number of replications is reached, yielding
+        the ensemble's progress after each replication.
+        """
+        pool = None if self.workers == 1 else Pool(self.workers)
+        try:
+            while not self.converged and self.replications < self.max_replications:
+                arguments = [(self.episode_factory, self.metrics, seed) for seed in self.next_seeds(self.workers)]
+
+                if pool is None:
+                    results = map(_perform_replication, arguments)
+                else:
+                    results = pool.imap(_perform_replication, arguments)
+
+                for measurements in results:
+                    self.record(measurements)
+                    yield self.progress
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    def run(self, progress_listener=None):
+        """
+        Performs replications until convergence, passing progress to the optional listener after each replication.
+        :return: the final progress of the ensemble.
+        """
+        for progress in self.iterate():
+            if progress_listener is not None:
+                progress_listener(progress)
+        return self.progress
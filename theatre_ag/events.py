@@ -0,0 +1,133 @@
+"""
+@author twsswt
+"""
+
+from Queue import Queue, Full, Empty
+from threading import Lock
+
+TICK_STARTED = 'tick_started'
+TICK_COMPLETED = 'tick_completed'
+TASK_INITIATED = 'task_initiated'
+TASK_COMPLETED = 'task_completed'
+
+DROP = 'drop'
+BLOCK = 'block'
+
+
+class SimulationEvent(object):
+    """
+    Describes a tick or task event.  Task events also identify the actor and the task concerned.  Ticks are expressed on
+    the root clock's timeline, so events published by child clocks and their actors can be compared directly.
+    """
+
+    def __init__(self, kind, tick, actor=None, task=None):
+        self.kind = kind
+        self.tick = tick
+        self.actor = actor
+        self.task = task
+
+    def __repr__(self):
+        if self.task is None:
+            return "%s(%d)" % (self.kind, self.tick)
+        else:
+            return "%s(%d, %s, %s)" % (self.kind, self.tick, self.actor, self.task)
+
+
+class Subscription(object):
+    """
+    A bounded buffer of the events published to an event stream, optionally restricted to a set of event kinds.  When
+    the buffer is full, new events are either dropped and counted (DROP) or the publisher blocks until the consumer
+    makes space (BLOCK).  A subscription that batches per tick buffers a single list of events for each closed tick,
+    instead of individual events.
+    """
+
+    def __init__(self, kinds=None, buffer_size=1024, full_policy=DROP, batch_per_tick=False):
+        self.kinds = None if kinds is None else frozenset(kinds)
+        self.full_policy = full_policy
+        self.batch_per_tick = batch_per_tick
+
+        self.buffer = Queue(buffer_size)
+        self.dropped = 0
+        self._batch = list()
+
+    def accepts(self, kind):
+        return self.kinds is None or kind in self.kinds
+
+    def receive(self, event):
+        if self.batch_per_tick:
+            self._batch.append(event)
+        else:
+            self.offer(event)
+
+    def offer(self, item):
+        if self.full_policy == BLOCK:
+            self.buffer.put(item)
+        else:
+            try:
+                self.buffer.put_nowait(item)
+            except Full:
+                self.dropped += 1
+
+    def flush(self):
+        batch, self._batch = self._batch, list()
+        if len(batch) > 0:
+            self.offer(batch)
+
+    def get(self, timeout=None):
+        """
+        :return: the next buffered event, or list of events if the subscription batches per tick.
+        :raises Empty: if nothing is buffered before the timeout elapses.
+        """
+        return self.buffer.get(True, timeout)
+
+    def drain(self):
+        """
+        :return: everything currently buffered, without blocking.
+        """
+        result = list()
+        try:
+            while True:
+                result.append(self.buffer.get_nowait())
+        except Empty:
+            return result
+
+
+class EventStream(object):
+    """
+    Publishes tick and task events to subscriptions.  Each clock has an event stream, to which the clock publishes
+    tick events and the clock's actors publish the initiation and completion of the tasks they record.  Events are
+    only constructed while the stream has subscriptions.
+    """
+
+    def __init__(self):
+        self._subscriptions = tuple()
+        self._subscriptions_lock = Lock()
+
+    @property
+    def has_subscribers(self):
+        return len(self._subscriptions) > 0
+
+    def subscribe(self, kinds=None, buffer_size=1024, full_policy=DROP, batch_per_tick=False):
+        subscription = Subscription(kinds, buffer_size, full_policy, batch_per_tick)
+        self._subscriptions_lock.acquire()
+        self._subscriptions = self._subscriptions + (subscription,)
+        self._subscriptions_lock.release()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscriptions_lock.acquire()
+        self._subscriptions = tuple(filter(lambda s: s is not subscription, self._subscriptions))
+        self._subscriptions_lock.release()
+
+    def publish(self, kind, tick, actor=None, task=None):
+        event = None
+        for subscription in self._subscriptions:
+            if subscription.accepts(kind):
+                if event is None:
+                    event = SimulationEvent(kind, tick, actor, task)
+                subscription.receive(event)
+
+    def close_tick(self, tick):
+        for subscription in self._subscriptions:
+            if subscription.batch_per_tick:
+                subscription.flush()
@@ -0,0 +1,115 @@
+"""
+@author twsswt
+"""
+
+import sys
+
+from collections import deque
+from Queue import Queue, Full
+from threading import Thread
+
+
+class FailureRecord(object):
+    """
+    Describes an exception raised by a task's workflow, with the tick it was caught on, the top level task it
+    interrupted and descriptions of the chain of tasks that were active when the exception was raised, from the top
+    level task to the innermost.
+    """
+
+    def __init__(self, actor, tick, task, exception, task_chain=None):
+        self.actor = actor
+        self.tick = tick
+        self.task = task
+        self.exception = exception
+
+        if task_chain is None:
+            task_chain = list() if task is None else [str(task)]
+        self.task_chain = task_chain
+
+    def __str__(self):
+        return "Warning, actor [%s] encountered exception [%s], in workflow [%s] at tick [%s].\n" % \
+            (self.actor, self.exception, ' -> '.join(self.task_chain), self.tick)
+
+
+class FailureLog(object):
+    """
+    Counts the exceptions raised by an actor's tasks, in total and per workflow entry point, and retains a bounded
+    number of the most recent failures.  Each failure is also passed to the log's sink, if it has one.
+    """
+
+    def __init__(self, capacity=100, sink=None):
+        self.count = 0
+        self.counts = dict()
+        self.recent = deque(maxlen=capacity)
+        self.sink = sink
+
+    def record(self, actor, tick, task, exception, task_chain=None):
+        self.count += 1
+
+        key = None if task is None else task.entry_point_key
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+        failure = FailureRecord(actor, tick, task, exception, task_chain)
+        self.recent.append(failure)
+
+        if self.sink is not None:
+            self.sink.write(failure)
+
+    def merge(self, other):
+        """
+        Incorporates the counts and recent failures of another log into this one.
+        :return: this log.
+        """
+        self.count += other.count
+        for key, count in list(other.counts.items()):
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.recent.extend(list(other.recent))
+        return self
+
+    @staticmethod
+    def merged(logs, capacity=100):
+        """
+        :return: a new log combining the failures of the specified logs.
+        """
+        result = FailureLog(capacity)
+        for log in logs:
+            result.merge(log)
+        return result
+
+
+class AsyncFailureSink(object):
+    """
+    Formats failures and writes them on a background thread, so that actors do not block on slow output.  Failures
+    are buffered in a bounded queue and dropped, and counted, when the buffer is full.  Several failure logs may share
+    a sink.  By default, failures are written to whatever <code>sys.stderr</code> is at the time of writing.
+    """
+
+    def __init__(self, write=None, buffer_size=1024):
+        self.buffer = Queue(buffer_size)
+        self.dropped = 0
+        self._write = write
+
+        self.thread = Thread(target=self.drain)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write(self, failure):
+        try:
+            self.buffer.put_nowait(failure)
+        except Full:
+            self.dropped += 1
+
+    def drain(self):
+        while True:
+            failure = self.buffer.get()
+            try:
+                write = sys.stderr.write if self._write is None else self._write
+                write(str(failure))
+            finally:
+                self.buffer.task_done()
+
+    def flush(self):
+        """
+        Blocks until every buffered failure has been written.
+        """
+        self.buffer.join()
@@ -0,0 +1,78 @@
+"""
+@author twsswt
+"""
+
+
+class Message(object):
+    """
+    A message sent from one actor to another, recording the tick during which the message was sent.
+    """
+
+    def __init__(self, sender, receiver, content, sent_tick):
+        self.sender = sender
+        self.receiver = receiver
+        self.content = content
+        self.sent_tick = sent_tick
+
+    def __repr__(self):
+        return "m(%s->%s@%s:%s)" % (self.sender, self.receiver, self.sent_tick, self.content)
+
+
+class Mailbox(object):
+    """
+    Holds the messages sent by and delivered to a single actor.  Messages sent during a tick are buffered in the
+    mailbox's outbox without locking, since only the owning actor posts to it, and are moved to receivers' inboxes by a
+    post office at the tick boundary.
+    """
+
+    def __init__(self, owner, post_office):
+        self.owner = owner
+        self.post_office = post_office
+
+        self._outbox = list()
+        self._inbox = list()
+
+    def post(self, receiver, content, tick):
+        if len(self._outbox) == 0:
+            self.post_office.notify_pending(self)
+        self._outbox.append(Message(self.owner, receiver, content, tick))
+
+    def collect(self):
+        outbox, self._outbox = self._outbox, list()
+        return outbox
+
+    def deliver(self, message):
+        self._inbox.append(message)
+
+    def drain(self):
+        """
+        Removes and returns all messages delivered to the mailbox in delivery order.
+        """
+        inbox, self._inbox = self._inbox, list()
+        return inbox
+
+    @property
+    def messages_waiting(self):
+        return len(self._inbox) > 0
+
+
+class PostOffice(object):
+    """
+    Delivers the messages buffered in mailboxes in a single batch when a clock tick closes.  Delivery order is
+    deterministic: messages are grouped by sender in the order the senders were created and then by the order in which
+    each sender posted them.
+    """
+
+    def __init__(self):
+        self._pending = list()
+
+    def notify_pending(self, mailbox):
+        self._pending.append(mailbox)
+
+    def close_tick(self, tick):
+        pending, self._pending = self._pending, list()
+        pending.sort(key=lambda mailbox: mailbox.owner.sequence)
+
+        for mailbox in pending:
+            for message in mailbox.collect():
+                message.receiver.mailbox.deliver(message)
@@ -0,0 +1,103 @@
+"""
+@author twsswt
+"""
+
+from collections import Mapping
+
+
+def last_write_wins(key, current_value, proposed_values):
+    return proposed_values[-1]
+
+
+def first_write_wins(key, current_value, proposed_values):
+    return proposed_values[0]
+
+
+class SceneSnapshot(Mapping):
+    """
+    A read only view of the state committed to a scene at the end of a tick.
+    """
+
+    def __init__(self, state):
+        self._state = state
+
+    def __getitem__(self, key):
+        return self._state[key]
+
+    def __iter__(self):
+        return iter(self._state)
+
+    def __len__(self):
+        return len(self._state)
+
+
+class Scene(object):
+    """
+    Versioned shared state that actors manipulate when they execute workflows.  Reads made during tick t observe an
+    immutable snapshot of the scene as it stood at the end of tick t-1, so no locking is needed to read.  Writes are
+    buffered and applied when the clock closes the tick.  Where several writes are made to the same key during a tick,
+    the conflict resolver is passed the key, the key's current value and the proposed values, and returns the value to
+    commit.  Proposed values are ordered by writer, in the order the writing actors were created, and then by the order
+    in which each writer made them.
+    """
+
+    def __init__(self, clock, initial_state=None, conflict_resolver=last_write_wins):
+        self.clock = clock
+        self.conflict_resolver = conflict_resolver
+
+        self._snapshot = dict() if initial_state is None else dict(initial_state)
+        self._version = None
+        self._pending_writes = list()
+
+        self.clock.add_tick_boundary_listener(self)
+
+    @property
+    def version(self):
+        """
+        :return: the tick at whose close the current snapshot was committed, or None for the initial state.
+        """
+        return self._version
+
+    @property
+    def snapshot(self):
+        return SceneSnapshot(self._snapshot)
+
+    def read(self, key, default=None):
+        return self._snapshot.get(key, default)
+
+    def __getitem__(self, key):
+        return self._snapshot[key]
+
+    def __contains__(self, key):
+        return key in self._snapshot
+
+    def write(self, key, value, writer):
+        """
+        Buffers a write by the writing actor to the scene, to be applied when the current tick closes.
+        :raises ValueError: if the writer listens to a different clock to the scene, since the write could race with the
+        scene's commit.
+        """
+        if writer.clock is not self.clock:
+            raise ValueError("Actor [%s] cannot write to a scene on a different clock." % writer)
+        self._pending_writes.append((writer.sequence, key, value))
+
+    def close_tick(self, tick):
+        pending_writes, self._pending_writes = self._pending_writes, list()
+
+        if len(pending_writes) > 0:
+            pending_writes.sort(key=lambda write: write[0])
+
+            proposals = dict()
+            for _, key, value in pending_writes:
+                proposals.setdefault(key, list()).append(value)
+
+            snapshot = dict(self._snapshot)
+            for key, proposed_values in proposals.items():
+                if len(proposed_values) == 1:
+                    snapshot[key] = proposed_values[0]
+                else:
+                    snapshot[key] = self.conflict_resolver(key, snapshot.get(key), proposed_values)
+
+            self._snapshot = snapshot
+
+        self._version = tick
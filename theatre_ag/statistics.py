@@ -0,0 +1,158 @@
+"""
+@author twsswt
+"""
+
+
+class RunningStatistics(object):
+    """
+    Constant memory summary of a stream of non-negative integer observations, such as task durations in ticks.
+    Observations are summarised by running moments and a histogram with power of two bucket widths, from which
+    approximate quantiles can be estimated.  Summaries can be merged, so that statistics gathered separately by actors,
+    casts or replications can be combined.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self._mean = 0.0
+        self._sum_of_squared_deviations = 0.0
+        self.histogram = dict()
+
+    @staticmethod
+    def bucket_of(value):
+        return int(value).bit_length()
+
+    @staticmethod
+    def bucket_upper_bound(bucket):
+        return (1 << bucket) - 1
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+        delta = value - self._mean
+        self._mean += delta / float(self.count)
+        self._sum_of_squared_deviations += delta * (value - self._mean)
+
+        bucket = RunningStatistics.bucket_of(value)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def merge(self, other):
+        """
+        Incorporates the observations summarised by another RunningStatistics object into this one.
+        :return: this object.
+        """
+        if other.count == 0:
+            return self
+
+        count = self.count + other.count
+        delta = other._mean - self._mean
+
+        self._sum_of_squared_deviations += \
+            other._sum_of_squared_deviations + delta * delta * self.count * other.count / float(count)
+        self._mean += delta * other.count / float(count)
+
+        self.count = count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+        for bucket, bucket_count in list(other.histogram.items()):
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + bucket_count
+
+        return self
+
+    @property
+    def mean(self):
+        return None if self.count == 0 else self._mean
+
+    @property
+    def variance(self):
+        return None if self.count < 2 else self._sum_of_squared_deviations / (self.count - 1)
+
+    def quantile(self, q):
+        """
+        :return: an upper bound on the q'th quantile of the observations, accurate to the enclosing histogram bucket.
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(RunningStatistics.bucket_upper_bound(bucket), self.maximum)
+
+        return self.maximum
+
+    def __repr__(self):
+        return "stats(n=%d, mean=%s, min=%s, max=%s)" % (self.count, self.mean, self.minimum, self.maximum)
+
+
+class StatisticsCollector(object):
+    """
+    Collects running task duration statistics per workflow entry point, and the number of ticks an actor spent busy
+    with top level tasks or idling.  An actor feeds its collector from <code>log_task_completion</code> when one is
+    assigned to the actor's <code>statistics</code> attribute.  Collectors can be queried while a simulation is
+    running and merged across actors, casts and replications.
+    """
+
+    def __init__(self):
+        self.durations = dict()
+        self.busy_ticks = 0
+        self.idle_ticks = 0
+
+    def record_task(self, task, top_level=False, idling=False):
+        duration = task.finish_tick - task.start_tick
+
+        if idling and top_level:
+            self.idle_ticks += duration
+            return
+
+        if top_level:
+            self.busy_ticks += duration
+
+        key = task.entry_point_key
+        statistics = self.durations.get(key)
+        if statistics is None:
+            statistics = self.durations[key] = RunningStatistics()
+        statistics.record(duration)
+
+    @property
+    def utilisation(self):
+        """
+        :return: the fraction of observed ticks spent busy with top level tasks, or None if no ticks were observed.
+        """
+        observed_ticks = self.busy_ticks + self.idle_ticks
+        return None if observed_ticks == 0 else self.busy_ticks / float(observed_ticks)
+
+    def duration_statistics(self, entry_point_key):
+        return self.durations.get(entry_point_key, RunningStatistics())
+
+    def merge(self, other):
+        """
+        Incorporates the statistics gathered by another collector into this one.
+        :return: this collector.
+        """
+        self.busy_ticks += other.busy_ticks
+        self.idle_ticks += other.idle_ticks
+
+        for key, statistics in list(other.durations.items()):
+            self.durations.setdefault(key, RunningStatistics()).merge(statistics)
+
+        return self
+
+    @staticmethod
+    def merged(collectors):
+        """
+        :return: a new collector combining the statistics of the specified collectors.
+        """
+        result = StatisticsCollector()
+        for collector in collectors:
+            result.merge(collector)
+        return result
@@ -8,34 +8,90 @@ import sys
 PYTHON_VERSION = sys.version[0]
 
 
-class Task(object):
+def anonymous_workflow_class(entry_point):
     """
-    Captures status information about a task to be performed by an actor.
+    :return: a workflow class with the function as a static member, created on first use and cached on the function.
     """
+    workflow_class = getattr(entry_point, 'anonymous_workflow_class', None)
 
-    def __init__(self, entry_point, workflow=None, args=(), parent=None):
+    if workflow_class is None:
+        entry_point_name = entry_point.func_name if PYTHON_VERSION == '2' else entry_point.__name__
+        workflow_class = type('AnonymousWorkflow', (object,),
+                              {'is_workflow': True, entry_point_name: staticmethod(entry_point)})
+        entry_point.anonymous_workflow_class = workflow_class
 
-        self.entry_point = entry_point
-        self.workflow = workflow
+    return workflow_class
 
-        if self.workflow is None:
 
-            if hasattr(entry_point, 'im_self'):
-                self.workflow = entry_point.im_self
+def resolve_workflow(entry_point):
+    """
+    :return: the workflow that a task entry point allocated without one belongs to, the workflow enclosing a function
+    defined within a workflow method, or a new instance of an anonymous workflow for a plain function.
+    """
+    if hasattr(entry_point, 'im_self'):
+        return entry_point.im_self
 
-            elif entry_point.func_closure is not None:
-                self.workflow = entry_point.func_closure[1].cell_contents
+    closure = entry_point.func_closure if PYTHON_VERSION == '2' else entry_point.__closure__
 
-            else:
+    if closure is not None:
+        return closure[1].cell_contents
 
-                class AnonymousWorkflow(object):
-                    is_workflow = True
+    return anonymous_workflow_class(entry_point)()
 
-                self.workflow = AnonymousWorkflow()
-                if PYTHON_VERSION == '2':
-                    setattr(self.workflow, entry_point.func_name, entry_point)
-                else:
-                    setattr(self.workflow, entry_point.__name__, entry_point)
+
+class TaskRun(object):
+    """
+    A compressed record of consecutive, identical sibling sub tasks without sub tasks of their own, each taking the same
+    number of ticks and starting on the tick its predecessor finished.  The run is expanded into Task objects on demand.
+    """
+
+    def __init__(self, task):
+        self.entry_point = task.entry_point
+        self.workflow = task.workflow
+        self.args = task.args
+        self.parent = task.parent
+
+        self.start_tick = task.start_tick
+        self.duration = task.finish_tick - task.start_tick
+        self.count = 1
+
+    @property
+    def finish_tick(self):
+        return self.start_tick + self.duration * self.count
+
+    def extends_with(self, task):
+        return task.completed and len(task._sub_tasks) == 0 and \
+            task.start_tick == self.finish_tick and task.finish_tick - task.start_tick == self.duration and \
+            task.workflow is self.workflow and task.entry_point == self.entry_point and task.args == self.args
+
+    def expand(self):
+        result = list()
+        for index in range(0, self.count):
+            task = Task(self.entry_point, self.workflow, self.args, parent=self.parent)
+            task.initiate(self.start_tick + index * self.duration)
+            task.complete(self.start_tick + (index + 1) * self.duration)
+            result.append(task)
+        return result
+
+    def __repr__(self):
+        args = ','.join(map(lambda e: str(e), self.args))
+        return '%d*%s(%s)[%d->%d]' % (self.count, self.entry_point.__name__, args, self.start_tick, self.finish_tick)
+
+
+class Task(object):
+    """
+    Captures status information about a task to be performed by an actor.  If <code>compress_runs</code> is set, runs
+    of consecutive identical sub tasks are folded into TaskRun records as they complete, and are only expanded into
+    Task objects when <code>sub_tasks</code> is read.  Sub tasks inherit the setting from their parent.
+
+    If no workflow is specified, the workflow is resolved from the entry point when it is first needed, usually when
+    the task is performed.
+    """
+
+    def __init__(self, entry_point, workflow=None, args=(), parent=None):
+
+        self.entry_point = entry_point
+        self._workflow = workflow
 
         self.parent = parent
         self.args = args
@@ -43,18 +99,80 @@ class Task(object):
         self.start_tick = None
         self.finish_tick = None
 
-        self.sub_tasks = list()
+        self.compress_runs = False if parent is None else parent.compress_runs
+        self._sub_tasks = list()
+        self._has_runs = False
+        self._expanded_sub_tasks = None
+
+    @property
+    def workflow(self):
+        if self._workflow is None:
+            self._workflow = resolve_workflow(self.entry_point)
+        return self._workflow
+
+    @workflow.setter
+    def workflow(self, workflow):
+        self._workflow = workflow
+
+    @property
+    def sub_tasks(self):
+        if not self._has_runs:
+            return self._sub_tasks
+
+        if self._expanded_sub_tasks is None:
+            expanded_sub_tasks = list()
+            for sub_task in self._sub_tasks:
+                if isinstance(sub_task, TaskRun):
+                    expanded_sub_tasks.extend(sub_task.expand())
+                else:
+                    expanded_sub_tasks.append(sub_task)
+            self._expanded_sub_tasks = expanded_sub_tasks
+
+        return self._expanded_sub_tasks
+
+    @property
+    def compressed_sub_tasks(self):
+        """
+        :return: the task's sub tasks, with runs of identical sub tasks represented by TaskRun records.
+        """
+        return self._sub_tasks
 
     def initiate(self, start_tick):
         self.start_tick = start_tick
 
     def append_sub_task(self, entry_point, workflow=None, args=()):
         sub_task = Task(entry_point, workflow, args, parent=self)
-        self.sub_tasks.append(sub_task)
+        self._sub_tasks.append(sub_task)
+        self._expanded_sub_tasks = None
         return sub_task
 
     def complete(self, finish_tick):
         self.finish_tick = finish_tick
+        if self.parent is not None and self.parent.compress_runs:
+            self.parent.fold_last_sub_task()
+
+    def fold_last_sub_task(self):
+        """
+        Folds the most recently completed sub task into a run with its predecessor if the two are identical.
+        """
+        if len(self._sub_tasks) < 2:
+            return
+
+        sub_task = self._sub_tasks[-1]
+        predecessor = self._sub_tasks[-2]
+
+        if isinstance(predecessor, TaskRun):
+            run = predecessor
+        elif predecessor.completed and len(predecessor._sub_tasks) == 0:
+            run = TaskRun(predecessor)
+        else:
+            return
+
+        if run.extends_with(sub_task):
+            run.count += 1
+            self._sub_tasks[-2:] = [run]
+            self._has_runs = True
+            self._expanded_sub_tasks = None
 
     @property
     def siblings(self):
@@ -102,6 +220,25 @@ class Task(object):
     def entry_point_name(self):
         return self.entry_point_func.func_name
 
+    @property
+    def entry_point_key(self):
+        """
+        :return: the name of the task's workflow class and entry point, used to group tasks in statistics and logs.
+        """
+        return "%s.%s" % (type(self.workflow).__name__, self.entry_point.__name__)
+
+    @property
+    def task_chain(self):
+        """
+        :return: descriptions of the task and its ancestors, from the top level task down to this one.
+        """
+        task_chain = list()
+        task = self
+        while task is not None:
+            task_chain.insert(0, str(task))
+            task = task.parent
+        return task_chain
+
     def __repr__(self):
 
         start_tick = '?' if self.start_tick is None else str(self.start_tick)
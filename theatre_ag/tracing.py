@@ -0,0 +1,52 @@
+"""
+@author twsswt
+"""
+
+TRACE_NONE = 'none'
+TRACE_TOP_LEVEL = 'top_level'
+TRACE_DEPTH_LIMITED = 'depth_limited'
+TRACE_FULL = 'full'
+
+
+class TracingPolicy(object):
+    """
+    Determines which workflow invocations an actor records as tasks.  Policies can be assigned to an actor as its
+    <code>tracing_policy</code> attribute, or to a workflow class as a class attribute of the same name, in which case
+    the workflow class's policy takes precedence for invocations of that workflow's methods.
+
+    Levels are TRACE_NONE (no tasks are recorded), TRACE_TOP_LEVEL (only tasks taken from an actor's task source are
+    recorded), TRACE_DEPTH_LIMITED (sub tasks are recorded up to max_depth below the top level task) and TRACE_FULL.
+    Sub tasks admitted by the level and depth checks are further sampled, so that only one in every
+    <code>sample_every</code> admitted sub tasks is recorded.  Unrecorded invocations still incur their delays, but neither they nor their sub tasks create Task
+    objects.
+    """
+
+    def __init__(self, level=TRACE_FULL, max_depth=None, sample_every=1):
+        self.level = level
+        self.max_depth = max_depth
+        self.sample_every = sample_every
+
+    @property
+    def records_tasks(self):
+        return self.level != TRACE_NONE
+
+    def admits_sub_task(self, depth):
+        """
+        :param depth: the depth of the sub task below its top level task, starting from 1.
+        :return: True if the policy's level and depth limit allow the sub task to be considered for sampling.
+        """
+        if self.level == TRACE_NONE or self.level == TRACE_TOP_LEVEL:
+            return False
+        elif self.level == TRACE_DEPTH_LIMITED and self.max_depth is not None and depth > self.max_depth:
+            return False
+        else:
+            return True
+
+    def samples(self, sample_count):
+        """
+        :param sample_count: the number of sub tasks previously admitted under this policy.
+        """
+        return sample_count % self.sample_every == 0
+
+
+FULL_TRACING = TracingPolicy()
@@ -0,0 +1,121 @@
+"""
+@author twsswt
+"""
+
+import sys
+import time
+import traceback
+
+
+class StalledTickException(Exception):
+    """
+    Raised by a stall watchdog that is configured to abort when a clock's tick barrier stalls.
+    """
+
+    def __init__(self, report):
+        self.report = report
+
+    def __str__(self):
+        return str(self.report)
+
+
+class StalledListener(object):
+    """
+    Diagnostic information about a tick listener that was not waiting for the next tick when a stall was detected,
+    including descriptions of the listener's current chain of tasks and its thread's stack at the time.
+    """
+
+    def __init__(self, listener):
+        self.listener = listener
+        self.task_chain = StalledListener.task_chain_of(listener)
+        self.stack = StalledListener.stack_of(listener)
+
+    @staticmethod
+    def task_chain_of(listener):
+        task = getattr(listener, 'current_task', None)
+        return list() if task is None else task.task_chain
+
+    @staticmethod
+    def stack_of(listener):
+        thread = getattr(listener, 'thread', None)
+        frame = None if thread is None else sys._current_frames().get(thread.ident)
+        return list() if frame is None else traceback.format_stack(frame)
+
+    def __str__(self):
+        result = "  %s in task chain [%s]\n" % (self.listener, ' -> '.join(self.task_chain))
+        return result + ''.join(map(lambda line: '    ' + line, self.stack))
+
+
+class StallReport(object):
+    """
+    Describes the tick listeners holding up a clock's tick barrier after the watchdog's threshold was exceeded.
+    """
+
+    def __init__(self, clock, waited, stalled_listeners):
+        self.clock = clock
+        self.tick = clock.current_tick
+        self.waited = waited
+        self.stalled_listeners = stalled_listeners
+
+    def __str__(self):
+        result = "Warning, clock [%s] waited %.1f seconds to close tick [%d] for:\n" % (self.clock, self.waited, self.tick)
+        return result + ''.join(map(str, self.stalled_listeners))
+
+
+def write_stall_report(report):
+    sys.stderr.write(str(report))
+
+
+class StallWatchdog(object):
+    """
+    Watches a clock's tick barrier and reports the tick listeners holding it up whenever the barrier has waited longer
+    than the threshold, in seconds.  Reports are retained by the watchdog and passed to the report handler, which
+    writes them to stderr by default.  If the watchdog aborts on stalls, the clock stops issuing ticks once the first
+    report is made, so that the listeners that are waiting can shut down cleanly.
+    """
+
+    def __init__(self, threshold, abort=False, report_handler=write_stall_report):
+        self.threshold = threshold
+        self.abort = abort
+        self.report_handler = report_handler
+        self.reports = list()
+
+    def stalled_listeners_of(self, tick_listeners):
+        """
+        :return: descriptions of the tick listeners that are not waiting for the next tick, including those of child
+        clocks among the listeners.
+        """
+        stalled_listeners = list()
+        for tick_listener in tick_listeners:
+            waiting_for_tick = tick_listener.waiting_for_tick
+            if hasattr(waiting_for_tick, 'pending_tick_listeners'):
+                stalled_listeners.extend(self.stalled_listeners_of(waiting_for_tick.pending_tick_listeners()))
+            elif hasattr(waiting_for_tick, 'is_set') and not waiting_for_tick.is_set():
+                stalled_listeners.append(StalledListener(tick_listener))
+        return stalled_listeners
+
+    def diagnose(self, clock, tick_listeners, waited):
+        return StallReport(clock, waited, self.stalled_listeners_of(tick_listeners))
+
+    def watch(self, clock, tick_listeners):
+        """
+        Blocks until all the tick listeners are waiting for the next tick, reporting each time the threshold elapses.
+        :raises StalledTickException: if the watchdog aborts on stalls and a stall is detected.
+        """
+        started = time.time()
+        last_reported = started
+
+        for tick_listener in tick_listeners:
+            while True:
+                remaining = self.threshold - (time.time() - last_reported)
+                if tick_listener.waiting_for_tick.wait(max(remaining, 0)):
+                    break
+
+                report = self.diagnose(clock, tick_listeners, time.time() - started)
+                self.reports.append(report)
+                self.report_handler(report)
+
+                if self.abort:
+                    raise StalledTickException(report)
+
+                last_reported = time.time()
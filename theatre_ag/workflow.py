@@ -2,11 +2,38 @@
 @author twsswt
 """
 
+import copy
 import inspect
 import sys
+from weakref import WeakSet
 PYTHON_VERSION = sys.version[0]
 
-registered_workflows = []
+registered_workflows = WeakSet()
+
+ACTOR_BINDINGS = ('actor', 'logging', 'workflow_pool')
+
+
+def unbound_state_of(workflow):
+    return dict((name, value) for name, value in workflow.__dict__.items() if name not in ACTOR_BINDINGS)
+
+
+def unbind_workflow(workflow, actor=None, visited=None):
+    """
+    Removes the actor bindings of the workflow and its nested workflow members, or only the bindings to the specified
+    actor if one is given, so that the workflows can be allocated afresh.
+    """
+    visited = set() if visited is None else visited
+    if id(workflow) in visited:
+        return
+    visited.add(id(workflow))
+
+    if actor is None or workflow.__dict__.get('actor') is actor:
+        workflow.__dict__.pop('actor', None)
+        workflow.__dict__.pop('logging', None)
+
+    for name, member in inspect.getmembers(workflow):
+        if hasattr(member.__class__, 'is_workflow'):
+            unbind_workflow(member, actor, visited)
 
 
 def default_cost(cost=0):
@@ -16,12 +43,29 @@ def default_cost(cost=0):
     return workflow_decorator
 
 
+def independent(workflow_member):
+    """
+    Declares that a workflow method, or every method of a workflow class, touches no state shared with other actors, so
+    that tasks invoking it can be performed in a batch with other independent tasks due in the same tick.
+    """
+    workflow_member.independent = True
+    return workflow_member
+
+
+def is_independent(entry_point, workflow):
+    return getattr(entry_point, 'independent', False) or getattr(type(workflow), 'independent', False)
+
+
 def allocate_workflow_to(actor, workflow, logging=True):
     """
     Allocates the workflow to the specified actor for timing synchronization purposes.  The members of the workflow are
     recursively inspected.  Any member with the class attribute 'is_workflow' is also allocated to this actor if it has
-    not previously been allocated to another actor.
+    not previously been allocated to another actor.  Pooled workflows that are already allocated to the actor are not
+    inspected again.
     """
+    if getattr(workflow, 'workflow_pool', None) is not None and workflow.actor is actor and workflow.logging == logging:
+        return
+
     workflow.actor = actor
     workflow.logging = logging
 
@@ -79,6 +123,9 @@ def treat_as_workflow(workflow_class):
                         else:
                             return attribute.__func__(self, *args, **kwargs) if inspect.ismethod(attribute) \
                                 else attribute(*args, **kwargs)
+                    except Exception as e:
+                        actor.capture_failure_context(e)
+                        raise
                     finally:
                         actor.log_task_completion()
                         actor.busy.release()
@@ -105,11 +152,74 @@ def treat_as_workflow(workflow_class):
             return attribute
 
     if workflow_class not in registered_workflows:
-        registered_workflows.append(workflow_class)
+        registered_workflows.add(workflow_class)
         workflow_class.__getattribute__ = __tracked_getattribute
 
 
 
+class WorkflowPool(object):
+    """
+    Hands out instances of a workflow that have been cloned from a prototype and allocated to an actor in advance, so
+    that tasks can be allocated without creating and inspecting a new workflow instance each time.  An instance is
+    returned to the pool by its actor once the task it was handed out for ends.  On return, the instance's
+    <code>reset</code> method is invoked if the workflow defines one, otherwise the instance's attributes are replaced
+    with fresh deep copies of the values they held when the instance was cloned.  Actors and clocks referred to by the
+    prototype are shared rather than copied, so the prototype may itself be allocated to an actor or refer to other
+    actors, and nested workflows in a clone are allocated to the pool's actor.
+    """
+
+    def __init__(self, actor, prototype, size=0):
+        self.actor = actor
+        self.prototype = prototype
+        self._available = list()
+        self._pooled_states = dict()
+
+        for _ in range(0, size):
+            self._available.append(self.clone_prototype())
+
+    def clone_prototype(self):
+        workflow_class = type(self.prototype)
+        workflow = workflow_class.__new__(workflow_class)
+        workflow.__dict__.update(copy.deepcopy(unbound_state_of(self.prototype)))
+        unbind_workflow(workflow)
+
+        allocate_workflow_to(self.actor, workflow)
+        workflow.workflow_pool = self
+        self._pooled_states[id(workflow)] = copy.deepcopy(unbound_state_of(workflow))
+        return workflow
+
+    def acquire(self):
+        try:
+            return self._available.pop()
+        except IndexError:
+            return self.clone_prototype()
+
+    def release(self, workflow):
+        try:
+            reset = workflow.__getattribute__('reset', ordinary_lookup=True)
+        except AttributeError:
+            bindings = dict((name, workflow.__dict__[name]) for name in ACTOR_BINDINGS if name in workflow.__dict__)
+            workflow.__dict__.clear()
+            workflow.__dict__.update(copy.deepcopy(self._pooled_states[id(workflow)]))
+            workflow.__dict__.update(bindings)
+        else:
+            reset()
+
+        self._available.append(workflow)
+
+    @property
+    def available(self):
+        return len(self._available)
+
+    def allocate_task(self, entry_point_name, args=list()):
+        """
+        Allocates a task for the named entry point of a pooled workflow instance to the pool's actor.
+        """
+        workflow = self.acquire()
+        entry_point = workflow.__getattribute__(entry_point_name, ordinary_lookup=True)
+        return self.actor.allocate_task(entry_point, workflow, args)
+
+
 class Idling(object):
 
     """